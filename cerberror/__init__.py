@@ -7,10 +7,27 @@ validator to customized messages defined by a user.
 
 """
 
-__all__ = ["ErrConverter", "PathFinder", "Translator"]
+__all__ = [
+    "Aggregator",
+    "AttributeFormat",
+    "ErrConverter",
+    "OverlayConverter",
+    "PathFinder",
+    "RecordTranslator",
+    "Registry",
+    "TranslatingErrorHandler",
+    "TranslatingValidator",
+    "Translator",
+    "preload",
+]
 __version__ = "0.1.1"
 __author__ = "Przemysław Bruś"
 
-from cerberror.errors import ErrConverter
+from cerberror.catalog import preload
+from cerberror.errors import AttributeFormat, ErrConverter, OverlayConverter
+from cerberror.handler import TranslatingErrorHandler, TranslatingValidator
 from cerberror.paths import PathFinder
+from cerberror.records import RecordTranslator
+from cerberror.registry import Registry
+from cerberror.report import Aggregator
 from cerberror.trans import Translator
@@ -0,0 +1,152 @@
+"""
+Command line interface of the package.
+
+Usage:
+    python -m cerberror profile --schema s.json --catalog msgs.txt docs.ndjson
+    python -m cerberror index msgs.txt
+
+"""
+
+import argparse
+import json
+import sys
+from typing import Iterator, List, Optional
+
+from cerberror.catalog import ENCODING, build_index
+from cerberror.profiler import Profiler
+
+
+def read_documents(path_to_file: str) -> Iterator[dict]:
+    """
+    Read documents from a file containing one JSON object per line.
+
+    Parameters
+    ----------
+    path_to_file : A name of the file with documents, "-" means the standard input.
+
+    Returns
+    -------
+    Iterator : Documents in order of appearance. Blank lines are skipped.
+
+    """
+    file = (
+        sys.stdin if path_to_file == "-" else open(path_to_file, "r", encoding=ENCODING)
+    )
+
+    try:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+    finally:
+        if file is not sys.stdin:
+            file.close()
+
+
+def profile(args: argparse.Namespace) -> int:
+    """
+    Run the profile command.
+
+    """
+    with open(args.schema, "r", encoding=ENCODING) as file:
+        schema = json.load(file)
+
+    profiler = Profiler(
+        schema, args.catalog, top=args.top, track_allocations=args.allocations
+    )
+    documents = read_documents(args.documents)
+
+    if args.tracemalloc:
+        import tracemalloc
+
+        tracemalloc.start()
+
+    if args.cprofile:
+        import cProfile
+
+        cprofile = cProfile.Profile()
+        cprofile.runcall(profiler.run, documents)
+        cprofile.dump_stats(args.cprofile)
+    else:
+        profiler.run(documents)
+
+    print(profiler.report())
+
+    if args.tracemalloc:
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        print("", "top allocations:", sep="\n")
+        for stat in snapshot.statistics("lineno")[: args.tracemalloc]:
+            print(f"  {stat}")
+
+    return 0
+
+
+def index(args: argparse.Namespace) -> int:
+    """
+    Run the index command.
+
+    """
+    print(build_index(args.catalog))
+
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Parse command line arguments and run a command.
+
+    Parameters
+    ----------
+    argv : A list of arguments. The default is sys.argv[1:].
+
+    Returns
+    -------
+    int : Exit status.
+
+    """
+    parser = argparse.ArgumentParser(prog="python -m cerberror")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    profile_parser = commands.add_parser(
+        "profile", help="measure phases of translating real documents"
+    )
+    profile_parser.add_argument(
+        "--schema", required=True, help="JSON file with a schema"
+    )
+    profile_parser.add_argument(
+        "--catalog", required=True, help="file with customized messages"
+    )
+    profile_parser.add_argument(
+        "--top", type=int, default=5, help="number of the slowest documents to show"
+    )
+    profile_parser.add_argument(
+        "--cprofile", metavar="FILE", help="dump cProfile stats"
+    )
+    profile_parser.add_argument(
+        "--tracemalloc",
+        metavar="N",
+        type=int,
+        default=0,
+        help="show N lines allocating the most memory",
+    )
+    profile_parser.add_argument(
+        "--allocations",
+        action="store_true",
+        help="show peak and retained memory of phases",
+    )
+    profile_parser.add_argument("documents", help="NDJSON file with documents or -")
+    profile_parser.set_defaults(func=profile)
+
+    index_parser = commands.add_parser(
+        "index", help="build an index loading the catalog lazily by top-level paths"
+    )
+    index_parser.add_argument("catalog", help="file with customized messages")
+    index_parser.set_defaults(func=index)
+
+    args = parser.parse_args(argv)
+
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,359 @@
+"""
+The module contains functions parsing files with customized messages and indexing them by top-level paths.
+
+Catalogs can also be parsed in advance with preload function, e.g. in the master process of a pre-forking
+server, so that workers share them copy-on-write.
+
+Besides records for exact paths, a catalog may contain defaults. A path ending with an ellipsis matches
+any path starting with the elements before it, e.g. ('billing', ...) matches ('billing',) and all paths
+under it, and (...,) matches any path. An exact record wins over defaults, a longer prefix wins over
+a shorter one.
+
+An index is a sidecar file (the name of a catalog with .idx suffix) which maps the first element of paths
+to byte ranges of the catalog. ErrConverter uses it to parse only those parts of the catalog which are
+actually needed.
+
+"""
+
+import gc
+import json
+import re
+from ast import literal_eval
+from pathlib import Path
+from functools import lru_cache
+from typing import Iterable, NamedTuple, Optional, Union
+
+INDEX_SUFFIX = ".idx"
+ENCODING = "utf-8"
+
+
+class Catalog(NamedTuple):
+    """
+    A parsed file with customized messages.
+
+    records : Records (path, code, message) in order of appearance in the file.
+    index : A dictionary composed of pairs (path, code):(tuple of messages).
+    templates : A dictionary composed of pairs (message):(tuple of names of attributes).
+    stat : Size and modification time of the file when it was parsed.
+    defaults : A dictionary composed of pairs (prefix, code):(tuple of messages), see index_defaults.
+    depths : A dictionary composed of pairs (code):(lengths of prefixes of defaults), see index_defaults.
+
+    """
+
+    records: tuple
+    index: dict
+    templates: dict
+    stat: tuple
+    defaults: dict
+    depths: dict
+
+
+_preloaded = dict()
+
+
+@lru_cache(maxsize=1024)
+def find_attributes(message: str) -> tuple:
+    """
+    Find names of attributes used within double curly brackets of a predefined message.
+
+    Parameters
+    ----------
+    message : Predefined message defined by a user.
+
+    Returns
+    -------
+    tuple : Names of attributes in order of appearance.
+
+    """
+    return tuple(i.strip("{}") for i in re.findall(r"{{[^{}]+}}", message))
+
+
+def parse_line(line: str) -> Optional[tuple]:
+    """
+    Parse a line of a file with customized messages.
+
+    Parameters
+    ----------
+    line : A line of the file.
+
+    Returns
+    -------
+    tuple : A record (path, code, message). None if the line is not a record, e.g. a comment.
+
+    """
+    record = re.split(r"^\s*([(].*[,].*[)])\s+(\d+)\s+([\"].+[\"])", line.strip())[1:-1]
+
+    if record == list():
+        return None
+
+    return tuple([i for i in map(literal_eval, record)])
+
+
+def index_records(records: Iterable[tuple], index: Optional[dict] = None) -> dict:
+    """
+    Group predefined messages by paths and error codes.
+
+    Parameters
+    ----------
+    records : Records (path, code, message). Defaults (paths ending with an ellipsis) are skipped,
+              see index_defaults.
+    index : A dictionary composed of pairs (path, code):(tuple of messages), updated in place. The default
+            is None, which means a new dictionary.
+
+    Returns
+    -------
+    dict : The updated index.
+
+    """
+    index = dict() if index is None else index
+
+    for path, code, message in records:
+        if (path == ()) or (path[-1] is not Ellipsis):
+            index[(path, code)] = index.get((path, code), ()) + (message,)
+
+    return index
+
+
+def index_defaults(records: Iterable[tuple], defaults: dict, depths: dict) -> None:
+    """
+    Add default messages of records to a fallback table.
+
+    Parameters
+    ----------
+    records : Records (path, code, message). Only those with a path ending with an ellipsis are defaults.
+    defaults : A dictionary composed of pairs (prefix, code):(tuple of messages), updated in place.
+    depths : A dictionary composed of pairs (code):(tuple of lengths of prefixes, from the longest one),
+             updated in place. A lookup probes defaults only for these lengths.
+
+    """
+    for path, code, message in records:
+        if (path != ()) and (path[-1] is Ellipsis):
+            key = (path[:-1], code)
+            defaults[key] = defaults.get(key, ()) + (message,)
+
+            if len(path) - 1 not in depths.get(code, ()):
+                depths[code] = tuple(
+                    sorted(depths.get(code, ()) + (len(path) - 1,), reverse=True)
+                )
+
+
+def prefix_key(path: tuple) -> str:
+    """
+    Get a key of a shard the path belongs to.
+
+    Parameters
+    ----------
+    path : Path to an element.
+
+    Returns
+    -------
+    str : repr() of the first element of the path, so string and integer keys are distinct.
+
+    """
+    return repr(path[0]) if path else "()"
+
+
+def index_path(path_to_file: Union[str, Path]) -> Path:
+    """
+    Get a name of the index of a file with customized messages.
+
+    Parameters
+    ----------
+    path_to_file : A name of the file storing customized error messages.
+
+    Returns
+    -------
+    Path : A name of the index file.
+
+    """
+    return Path(str(path_to_file) + INDEX_SUFFIX)
+
+
+def build_index(path_to_file: Union[str, Path]) -> Path:
+    """
+    Build the index of a file with customized messages and save it next to the file.
+
+    Parameters
+    ----------
+    path_to_file : A name of the file storing customized error messages.
+
+    Returns
+    -------
+    Path : A name of the index file.
+
+    """
+    shards = dict()
+    offset = 0
+    last_key = None
+
+    with open(path_to_file, "rb") as file:
+        for line in file:
+            record = parse_line(line.decode(ENCODING))
+
+            if record is not None:
+                key = prefix_key(record[0])
+                spans = shards.setdefault(key, [])
+
+                if (key == last_key) and (spans[-1][0] + spans[-1][1] == offset):
+                    spans[-1][1] += len(line)
+                else:
+                    spans.append([offset, len(line)])
+
+                last_key = key
+
+            offset += len(line)
+
+    stat = Path(path_to_file).stat()
+    index = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "shards": shards}
+
+    with open(index_path(path_to_file), "w", encoding=ENCODING) as file:
+        json.dump(index, file)
+
+    return index_path(path_to_file)
+
+
+def read_index(path_to_file: Union[str, Path]) -> Optional[dict]:
+    """
+    Read the index of a file with customized messages.
+
+    Parameters
+    ----------
+    path_to_file : A name of the file storing customized error messages.
+
+    Returns
+    -------
+    dict : A dictionary composed of pairs (shard key):(list of [offset, length] byte ranges). None if
+           there is no index, it cannot be read or it is older than the file.
+
+    """
+    try:
+        stat = Path(path_to_file).stat()
+
+        with open(index_path(path_to_file), "r", encoding=ENCODING) as file:
+            index = json.load(file)
+
+        if (index["size"], index["mtime_ns"]) != (stat.st_size, stat.st_mtime_ns):
+            return None
+
+        return index["shards"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def read_shard(path_to_file: Union[str, Path], spans: list) -> list:
+    """
+    Read records stored within byte ranges of a file with customized messages.
+
+    Parameters
+    ----------
+    path_to_file : A name of the file storing customized error messages.
+    spans : A list of [offset, length] byte ranges.
+
+    Returns
+    -------
+    list : Records (path, code, message) in order of appearance in the file.
+
+    """
+    records = list()
+
+    with open(path_to_file, "rb") as file:
+        for offset, length in spans:
+            file.seek(offset)
+
+            for line in file.read(length).decode(ENCODING).splitlines():
+                record = parse_line(line)
+
+                if record is not None:
+                    records.append(record)
+
+    return records
+
+
+def _stat(path_to_file: Union[str, Path]) -> tuple:
+    """
+    Get size and modification time of a file.
+
+    """
+    stat = Path(path_to_file).stat()
+
+    return stat.st_size, stat.st_mtime_ns
+
+
+def preload(paths: Iterable[Union[str, Path]], freeze: bool = False) -> dict:
+    """
+    Parse, index and compile templates of files with customized messages in advance.
+
+    ErrConverter objects created later for the same files, also in forked processes, use the parsed
+    catalogs instead of reading the files again. Records and messages are stored in tuples and none of
+    the objects is modified afterwards. To keep memory pages shared after fork(), call this function with
+    freeze=True (or call gc.freeze() yourself) in the master process right before forking workers.
+    The garbage collector then does not touch the preloaded objects.
+
+    Parameters
+    ----------
+    paths : Names of files storing customized error messages.
+    freeze : Run gc.collect() and gc.freeze() after parsing. The default is False.
+
+    Returns
+    -------
+    dict : A dictionary composed of pairs (resolved name of a file):(Catalog).
+
+    """
+    catalogs = dict()
+
+    for path_to_file in paths:
+        path = Path(path_to_file).resolve()
+        stat = _stat(path)
+
+        with open(path, "r", encoding=ENCODING) as file:
+            records = tuple(r for r in map(parse_line, file) if r is not None)
+
+        index = index_records(records)
+        templates = {message: find_attributes(message) for _, _, message in records}
+        defaults, depths = dict(), dict()
+        index_defaults(records, defaults, depths)
+        catalogs[path] = _preloaded[path] = Catalog(
+            records, index, templates, stat, defaults, depths
+        )
+
+    if freeze:
+        gc.collect()
+        gc.freeze()
+
+    return catalogs
+
+
+def preloaded(path_to_file: Union[str, Path]) -> Optional[Catalog]:
+    """
+    Get a preloaded catalog.
+
+    Parameters
+    ----------
+    path_to_file : A name of the file storing customized error messages.
+
+    Returns
+    -------
+    Catalog : A catalog. None if the file has not been preloaded or it has changed since then.
+
+    """
+    if not _preloaded:
+        return None
+
+    try:
+        path = Path(path_to_file).resolve()
+        catalog = _preloaded.get(path)
+
+        if (catalog is None) or (catalog.stat != _stat(path)):
+            return None
+    except OSError:
+        return None
+
+    return catalog
+
+
+def clear_preloaded() -> None:
+    """
+    Forget all preloaded catalogs.
+
+    """
+    _preloaded.clear()
@@ -0,0 +1,160 @@
+"""
+The module contains Diagnostics class which stores internal errors of the package in a bounded container.
+
+"""
+
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+NO_FILE = "no_file"
+NO_MESSAGES = "no_messages"
+INVALID_EXPRESSION = "invalid_expression"
+NO_RECORD = "no_record"
+NO_PATH = "no_path"
+
+TEMPLATES = {
+    NO_FILE: "File '{file}' does not exist",
+    NO_MESSAGES: "No customized messages have been found in '{file}' file",
+    INVALID_EXPRESSION: "Invalid expression '{{{{{attr}}}}}' in file '{file}'",
+    NO_RECORD: "File '{file}' does not contain a record for path {path} and error code {code}",
+    NO_PATH: "No path was found",
+}
+
+MAX_SIZE = 100
+
+
+class Diagnostics:
+    """
+    Diagnostics keeps internal errors as structured entries with numbers of occurrences.
+
+    Each entry is a tuple (kind, path, code, attr). Repeated errors only increase counters and the number
+    of distinct entries is limited, so the memory stays flat in long-lived processes. Messages are formatted
+    only on demand.
+
+    """
+
+    def __init__(
+        self, path_to_file: Union[str, Path], max_size: int = MAX_SIZE
+    ) -> None:
+        """
+        Initialize an object.
+
+        Parameters
+        ----------
+        path_to_file : A name of the file storing customized error messages.
+        max_size : Maximal number of distinct entries. The default is 100.
+
+        """
+        self._path_to_file = path_to_file
+        self._max_size = max_size
+        self._counts = dict()
+        self._dropped = 0
+
+    def report(
+        self,
+        kind: str,
+        path: Optional[tuple] = None,
+        code: Optional[int] = None,
+        attr: Optional[str] = None,
+    ) -> None:
+        """
+        Report an internal error.
+
+        Parameters
+        ----------
+        kind : Kind of an error, e.g. NO_RECORD.
+        path : Path to an element the error refers to.
+        code : Error code of Cerberus the error refers to.
+        attr : Name of an attribute the error refers to.
+
+        """
+        key = (kind, path, code, attr)
+
+        if key in self._counts:
+            self._counts[key] += 1
+        elif len(self._counts) < self._max_size:
+            self._counts[key] = 1
+        else:
+            self._dropped += 1
+
+    def clear(self) -> None:
+        """
+        Remove all entries.
+
+        """
+        self._counts.clear()
+        self._dropped = 0
+
+    def __len__(self) -> int:
+        """
+        Get a number of distinct entries.
+
+        """
+        return len(self._counts)
+
+    def __iter__(self) -> Iterator[tuple]:
+        """
+        Iterate over entries in order of occurrence.
+
+        """
+        return iter(self._counts)
+
+    def format(self, key: tuple) -> str:
+        """
+        Format an entry into a message.
+
+        Parameters
+        ----------
+        key : An entry (kind, path, code, attr).
+
+        Returns
+        -------
+        str : A message.
+
+        """
+        kind, path, code, attr = key
+
+        return TEMPLATES[kind].format(
+            file=self._path_to_file, path=path, code=code, attr=attr
+        )
+
+    @property
+    def counts(self) -> dict:
+        """
+        Get numbers of occurrences of entries.
+
+        Returns
+        -------
+        dict : A dictionary composed of pairs (kind, path, code, attr):(number of occurrences).
+
+        """
+        return self._counts
+
+    @property
+    def dropped(self) -> int:
+        """
+        Get a number of errors which have not been stored because of the size limit.
+
+        Returns
+        -------
+        int : A number of dropped errors.
+
+        """
+        return self._dropped
+
+    @property
+    def messages(self) -> list:
+        """
+        Get formatted messages, one per entry.
+
+        Returns
+        -------
+        list : List of messages. The last one informs about dropped errors, if any.
+
+        """
+        messages = [self.format(key) for key in self._counts]
+
+        if self._dropped > 0:
+            messages.append(f"{self._dropped} more errors have been dropped")
+
+        return messages
@@ -3,33 +3,147 @@ The module contains ErrConverter class replacing Cerberus errors to those define
 
 """
 
-import re
-from ast import literal_eval
+import sys
 from pathlib import Path
-from typing import Union
+from typing import Any, Iterable, NamedTuple, Optional, Union
 
 from cerberus.errors import ValidationError
 
+from cerberror.catalog import (
+    ENCODING,
+    find_attributes,
+    index_defaults,
+    index_records,
+    parse_line,
+    preloaded,
+    prefix_key,
+    read_index,
+    read_shard,
+)
+from cerberror.diagnostics import NO_FILE, NO_MESSAGES, Diagnostics
+
+CONSTRAINT_CACHE_SIZE = 1024
+
+
+class AttributeFormat(NamedTuple):
+    """
+    Options of formatting an attribute of ValidationError within a predefined message.
+
+    max_length : Maximal length of a formatted attribute. None means no limit.
+    ellipsis : A string which ends truncated attributes, itself cut if it is longer than max_length.
+    use_repr : Use repr() instead of str().
+
+    """
+
+    max_length: Optional[int] = None
+    ellipsis: str = "..."
+    use_repr: bool = False
+
+    def format(self, value: Any) -> str:
+        """
+        Format a value of an attribute.
+
+        Parameters
+        ----------
+        value : A value of an attribute.
+
+        Returns
+        -------
+        str : Formatted value. Long lists, tuples and strings are cut before formatting,
+              so the cost does not depend on their size.
+
+        """
+        if (self.max_length is not None) and isinstance(value, (list, tuple, str)):
+            if len(value) > self.max_length + 1:
+                value = value[: self.max_length + 1]
+
+        text = repr(value) if self.use_repr else str(value)
+
+        if (self.max_length is not None) and (len(text) > self.max_length):
+            ellipsis = self.ellipsis[: self.max_length]
+            text = text[: self.max_length - len(ellipsis)] + ellipsis
+
+        return text
+
+
+DEFAULT_FORMAT = AttributeFormat()
+
+
+def _sizeof(value: Any, seen: set) -> int:
+    """
+    Compute the size of an object together with its content, counting shared objects once.
+
+    """
+    if id(value) in seen:
+        return 0
+
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+
+    if isinstance(value, dict):
+        size += sum(_sizeof(k, seen) + _sizeof(v, seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_sizeof(i, seen) for i in value)
+
+    return size
+
 
 class ErrConverter:
     """
     ErrConverter converts errors produced by Cerberus to customized messages.
 
+    Catalogs preloaded with cerberror.preload are used without reading the file. Otherwise, if the file
+    has an up-to-date index (see cerberror.catalog.build_index), records are parsed lazily,
+    one shard per top-level path, when a message under the shard is looked up for the first time.
+
     """
 
-    def __init__(self, path_to_file: Union[str, Path]) -> None:
+    def __init__(
+        self, path_to_file: Union[str, Path], formats: Optional[dict] = None
+    ) -> None:
         """
         Initialize an object.
 
         Parameters
         ----------
         path_to_file : A name of the file storing customized error messages.
+        formats : A dictionary composed of pairs (attribute name):(AttributeFormat). Attributes
+                  without a format are converted by str().
 
         """
         self._path_to_file = Path(path_to_file)
+        self._formats = dict() if formats is None else dict(formats)
+        self._constraints = dict()
         self.any_error = False
-        self.error_list = list()
-        self._user_defined_records = self._read_predefined_messages()
+        self._diagnostics = Diagnostics(self._path_to_file)
+        self._templates = dict()
+        self._index = dict()
+        self._defaults = dict()
+        self._depths = dict()
+        self._loaded = set()
+        catalog = preloaded(self._path_to_file)
+        self._shards = read_index(self._path_to_file) if catalog is None else None
+
+        if catalog is not None:
+            self._user_defined_records = catalog.records
+            self._index = catalog.index
+            self._templates = catalog.templates
+            self._defaults = catalog.defaults
+            self._depths = catalog.depths
+
+            if self._user_defined_records == ():
+                self._report_error(NO_MESSAGES)
+        elif self._shards is None:
+            self._user_defined_records = self._read_predefined_messages()
+            self._add_records(self._user_defined_records)
+        else:
+            self._user_defined_records = None
+
+            if prefix_key((...,)) in self._shards:
+                self._load_shard(prefix_key((...,)))
+
+            if self._shards == dict():
+                self._report_error(NO_MESSAGES)
 
     def _read_predefined_messages(self) -> tuple:
         """
@@ -39,31 +153,90 @@ class ErrConverter:
         records = list()
 
         try:
-            with open(self._path_to_file, "r") as file:
+            with open(self._path_to_file, "r", encoding=ENCODING) as file:
                 for line in file:
-                    record = re.split(
-                        r"^\s*([(].*[,].*[)])\s+(\d+)\s+([\"].+[\"])", line.strip()
-                    )[1:-1]
-                    if record != list():
-                        records.append(tuple([i for i in map(literal_eval, record)]))
+                    record = parse_line(line)
+                    if record is not None:
+                        records.append(record)
 
             if len(records) == 0:
-                self._report_error(
-                    f"No customized messages have been found in '{self._path_to_file}' file"
-                )
+                self._report_error(NO_MESSAGES)
 
         except FileNotFoundError:
-            self._report_error(f"File '{self._path_to_file}' does not exist")
+            self._report_error(NO_FILE)
 
         return tuple(records)
 
-    def _report_error(self, error: str) -> None:
+    def _add_records(self, records: Iterable[tuple]) -> None:
+        """
+        Add records to the index and their defaults to the fallback table.
+
+        """
+        records = tuple(records)
+        index_records(records, self._index)
+        index_defaults(records, self._defaults, self._depths)
+
+    def _load_shard(self, key: str) -> None:
+        """
+        Parse records of a shard and add them to the index. Defaults for any path are in the shard
+        of an ellipsis, which is loaded at once.
+
+        """
+        self._loaded.add(key)
+
+        if key in self._shards:
+            self._add_records(read_shard(self._path_to_file, self._shards[key]))
+
+    def _report_error(self, kind: str, **details) -> None:
+        """
+        Notify errors of reading the file. Errors of converting are signalled by None returned from
+        convert_message and reported by callers with invalid_attributes, so a converter can be shared
+        by many translations.
+
+        """
+        if kind in (NO_FILE, NO_MESSAGES):
+            self.any_error = True
+
+        self._diagnostics.report(kind, **details)
+
+    def _attributes(self, message: str) -> tuple:
+        """
+        Get names of attributes of a message, compiled in advance if the catalog has been preloaded.
+
+        """
+        attributes = self._templates.get(message)
+
+        return find_attributes(message) if attributes is None else attributes
+
+    def format_attribute(self, error: ValidationError, attr: str) -> str:
         """
-        Notify occurred errors.
+        Format an attribute of an error. Constraints come from a schema, so they are cached by identity.
+
+        Parameters
+        ----------
+        error : ValidationError object from Cerberus.
+        attr : Name of an attribute.
+
+        Returns
+        -------
+        str : Formatted attribute.
 
         """
-        self.any_error = True
-        self.error_list.append(error)
+        value = getattr(error, attr)
+        attr_format = self._formats.get(attr, DEFAULT_FORMAT)
+
+        if attr != "constraint":
+            return attr_format.format(value)
+
+        cached = self._constraints.get(id(value))
+
+        if (cached is None) or (cached[0] is not value):
+            if len(self._constraints) >= CONSTRAINT_CACHE_SIZE:
+                self._constraints.clear()
+
+            cached = self._constraints[id(value)] = (value, attr_format.format(value))
+
+        return cached[1]
 
     def convert_message(self, error: ValidationError, message: str) -> str:
         """
@@ -77,22 +250,177 @@ class ErrConverter:
 
         Returns
         -------
-        message : Error message defined by a user. None if an error occurs.
+        message : Error message defined by a user. None if an attribute does not exist, invalid_attributes
+                  tells which ones.
+
+        """
+        for attr in self._attributes(message):
+            if not hasattr(error, attr):
+                return None
+
+            message = message.replace(
+                "{{" + attr + "}}", self.format_attribute(error, attr)
+            )
 
+        return message
+
+    def check_message(self, error: ValidationError, message: str) -> bool:
         """
-        any_error = False
-        attributes = [i.strip("{}") for i in re.findall(r"{{[^{}]+}}", message)]
+        Check whether all attributes used by a predefined message exist, without converting it.
+
+        Parameters
+        ----------
+        error : ValidationError object from Cerberus.
+        message : Predefined message defined by a user.
 
-        for attr in attributes:
-            if hasattr(error, attr):
-                message = message.replace("{{" + attr + "}}", str(getattr(error, attr)))
-            else:
-                any_error = True
-                self._report_error(
-                    f"Invalid expression '{{{{{attr}}}}}' in file '{self._path_to_file}'"
-                )
+        Returns
+        -------
+        bool : True if the message can be converted, otherwise False.
 
-        return message if not any_error else None
+        """
+        return self.invalid_attributes(error, message) == ()
+
+    def invalid_attributes(self, error: ValidationError, message: str) -> tuple:
+        """
+        Find attributes used by a predefined message which do not exist in an error.
+
+        Parameters
+        ----------
+        error : ValidationError object from Cerberus.
+        message : Predefined message defined by a user.
+
+        Returns
+        -------
+        tuple : Names of attributes in order of appearance in the message. Empty if the message can be
+                converted.
+
+        """
+        return tuple(
+            attr for attr in self._attributes(message) if not hasattr(error, attr)
+        )
+
+    def find_messages(self, path: tuple, code: int) -> tuple:
+        """
+        Find predefined messages for a path and an error code.
+
+        Parameters
+        ----------
+        path : Path to an element.
+        code : Error code of Cerberus.
+
+        Returns
+        -------
+        tuple : Predefined messages in order of appearance in the file. If there is no record for the
+                path, messages of the default with the longest matching prefix. Empty if nothing matches.
+
+        """
+        messages = self._find_exact(path, code)
+
+        return messages if messages != () else self._find_default(path, code)[1]
+
+    def _find_exact(self, path: tuple, code: int) -> tuple:
+        """
+        Find messages of records for exactly the path and the error code.
+
+        """
+        if self._shards is not None:
+            key = prefix_key(path)
+
+            if key not in self._loaded:
+                self._load_shard(key)
+
+        return self._index.get((path, code), ())
+
+    def _find_default(self, path: tuple, code: int) -> tuple:
+        """
+        Find messages of the default with the longest prefix of the path. Returns a pair (length of
+        the prefix, messages), (-1, ()) if no default matches.
+
+        """
+        for depth in self._depths.get(code, ()):
+            if depth <= len(path):
+                messages = self._defaults.get((path[:depth], code))
+
+                if messages is not None:
+                    return depth, messages
+
+        return -1, ()
+
+    def load_shards(self, keys: Iterable) -> None:
+        """
+        Parse shards of top-level keys in advance. It does nothing if the file has no index.
+
+        Parameters
+        ----------
+        keys : First elements of paths, e.g. keys of a schema.
+
+        """
+        if self._shards is None:
+            return
+
+        for key in keys:
+            key = prefix_key((key,))
+
+            if key not in self._loaded:
+                self._load_shard(key)
+
+    def footprint(self) -> int:
+        """
+        Estimate memory used by parsed messages.
+
+        Returns
+        -------
+        int : A number of bytes used by records, lookup tables and cached attributes. Objects shared
+              with other converters, e.g. a preloaded catalog, are counted too.
+
+        """
+        return _sizeof(
+            (
+                self._user_defined_records,
+                self._index,
+                self._defaults,
+                self._depths,
+                self._templates,
+                self._constraints,
+            ),
+            set(),
+        )
+
+    @property
+    def error_list(self) -> list:
+        """
+        Get list of errors which occurred while reading the file.
+
+        Returns
+        -------
+        list : List of messages.
+
+        """
+        return self._diagnostics.messages
+
+    @property
+    def diagnostics(self) -> Diagnostics:
+        """
+        Get structured errors which occurred while reading the file or converting messages.
+
+        Returns
+        -------
+        Diagnostics : Bounded container of errors.
+
+        """
+        return self._diagnostics
+
+    @property
+    def path_to_file(self) -> Path:
+        """
+        Get path to file which stores user defined records.
+
+        Returns
+        -------
+        Path : path to the file with customized messages.
+
+        """
+        return self._path_to_file
 
     @property
     def user_defined_records(self) -> tuple:
@@ -107,4 +435,128 @@ class ErrConverter:
                 - predefined message
 
         """
+        if self._user_defined_records is None:
+            self._user_defined_records = self._read_predefined_messages()
+            self._index, self._defaults, self._depths = dict(), dict(), dict()
+            self._add_records(self._user_defined_records)
+            self._loaded = set(self._shards)
+
         return self._user_defined_records
+
+    @property
+    def loaded_shards(self) -> tuple:
+        """
+        Get shards which have been parsed so far.
+
+        Returns
+        -------
+        tuple : Keys of shards (repr() of the first element of paths). Empty if the file has no index.
+
+        """
+        return tuple(self._loaded)
+
+
+class OverlayConverter(ErrConverter):
+    """
+    OverlayConverter stacks a file with a few overriding messages on a shared base converter.
+
+    Messages of the overlay replace all messages of the base for the same path and error code. Exact
+    records of both files win over defaults of both files, then the longest prefix wins and the overlay
+    wins a tie. Only the overlay is parsed, so many overlays (e.g. one per tenant) share one parsed base. Overlays can
+    be stacked on other overlays.
+
+    """
+
+    def __init__(
+        self,
+        path_to_file: Union[str, Path],
+        base: ErrConverter,
+        formats: Optional[dict] = None,
+    ) -> None:
+        """
+        Initialize an object.
+
+        Parameters
+        ----------
+        path_to_file : A name of the file storing overriding messages.
+        base : ErrConverter object with base messages. It can be shared by many overlays.
+        formats : A dictionary composed of pairs (attribute name):(AttributeFormat). The default is
+                  formats of the base.
+
+        """
+        self._base = base
+        super().__init__(path_to_file, base._formats if formats is None else formats)
+        self.any_error = self.any_error or base.any_error
+
+    def _report_error(self, kind: str, **details) -> None:
+        """
+        Notify occurred errors. An overlay without messages is not an error.
+
+        """
+        if kind != NO_MESSAGES:
+            super()._report_error(kind, **details)
+
+    def _find_exact(self, path: tuple, code: int) -> tuple:
+        """
+        Find messages of records for exactly the path and the error code, in the overlay first.
+
+        """
+        messages = super()._find_exact(path, code)
+
+        return messages if messages != () else self._base._find_exact(path, code)
+
+    def _find_default(self, path: tuple, code: int) -> tuple:
+        """
+        Find messages of the default with the longest prefix of the path in the overlay and the base.
+        The overlay wins if both have a default with the same prefix.
+
+        """
+        depth, messages = super()._find_default(path, code)
+        base_depth, base_messages = self._base._find_default(path, code)
+
+        return (depth, messages) if depth >= base_depth else (base_depth, base_messages)
+
+    @property
+    def base(self) -> ErrConverter:
+        """
+        Get the base converter.
+
+        Returns
+        -------
+        ErrConverter : The base converter.
+
+        """
+        return self._base
+
+    @property
+    def error_list(self) -> list:
+        """
+        Get list of errors which occurred while reading files.
+
+        Returns
+        -------
+        list : List of messages. Errors of the base are included if it could not be read.
+
+        """
+        base_errors = self._base.error_list if self._base.any_error else []
+
+        return base_errors + super().error_list
+
+    @property
+    def user_defined_records(self) -> tuple:
+        """
+        Get records of the merged view of the overlay and the base.
+
+        Returns
+        -------
+        tuple : Records of the overlay followed by records of the base which are not overridden.
+
+        """
+        records = super().user_defined_records
+        overridden = {(path, code) for path, code, _ in records}
+
+        return records + tuple(
+            record
+            for record in self._base.user_defined_records
+            if (record[0], record[1]) not in overridden
+        )
@@ -0,0 +1,256 @@
+"""
+The module contains TranslatingErrorHandler class which translates errors of Cerberus when they are emitted
+and TranslatingValidator class using it.
+
+"""
+
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+from cerberus import Validator
+from cerberus.errors import BasicErrorHandler, ValidationError
+
+from cerberror.diagnostics import INVALID_EXPRESSION, NO_RECORD, Diagnostics
+from cerberror.errors import ErrConverter
+
+
+class TranslatingErrorHandler(BasicErrorHandler):
+    """
+    TranslatingErrorHandler renders messages defined by a user as soon as Cerberus emits errors.
+
+    The layout of the errors is the same as the one of BasicErrorHandler. Errors without a record
+    keep their original Cerberus messages. Rendered messages are kept per emitted error, so errors
+    sorted by Cerberus after their emission are only rearranged instead of being translated again.
+
+    """
+
+    def __init__(
+        self,
+        tree: Optional[dict] = None,
+        path_to_file: Union[str, Path, None] = None,
+        converter: Optional[ErrConverter] = None,
+        formats: Optional[dict] = None,
+    ) -> None:
+        """
+        Initialize an object.
+
+        Parameters
+        ----------
+        tree : Initial tree of errors.
+        path_to_file : A name of the file storing customized error messages.
+        converter : ErrConverter object used instead of reading path_to_file.
+        formats : A dictionary composed of pairs (attribute name):(AttributeFormat).
+
+        """
+        super().__init__(tree)
+        if converter is None:
+            converter = ErrConverter(path_to_file, formats)
+
+        self._converter = converter
+        self._emitted = list()
+        self._nodes = list()
+        self._any_error = False
+        self._diagnostics = Diagnostics(self._converter.path_to_file)
+
+    def __call__(self, errors: Iterable[ValidationError]) -> dict:
+        """
+        Get translated errors in the order of Cerberus. They are rendered again only if they differ
+        from emitted ones.
+
+        """
+        errors = list(errors)
+
+        if errors != [error for error, _, _ in self._emitted]:
+            spans = {id(error): (start, end) for error, start, end in self._emitted}
+
+            if (len(errors) == len(spans)) and all(
+                id(error) in spans for error in errors
+            ):
+                self._rearrange(errors, spans)
+            else:
+                self.clear()
+                self.extend(errors)
+
+        return self.pretty_tree
+
+    def clear(self) -> None:
+        """
+        Remove all errors together with internal errors of their translation. Cerberus calls it
+        through start() whenever a validation starts.
+
+        """
+        super().clear()
+        self._emitted = list()
+        self._nodes = list()
+        self._any_error = False
+        self._diagnostics.clear()
+
+    def emit(self, error: ValidationError) -> None:
+        """
+        Translate an error at the moment when Cerberus emits it.
+
+        """
+        self.add(error)
+
+    def add(self, error: ValidationError) -> None:
+        """
+        Translate an error and insert it into the tree.
+
+        """
+        start = len(self._nodes)
+        self._add(error, error.document_path, error.field)
+        self._emitted.append((error, start, len(self._nodes)))
+
+    def _rearrange(self, errors: list, spans: dict) -> None:
+        """
+        Rebuild the tree from already rendered messages following the order of errors.
+
+        """
+        nodes = self._nodes
+        self.tree, self._emitted, self._nodes = dict(), list(), list()
+
+        for error in errors:
+            start, end = spans[id(error)]
+            self._emitted.append(
+                (error, len(self._nodes), len(self._nodes) + end - start)
+            )
+
+            for path, message in nodes[start:end]:
+                self._insert_error(path, message)
+                self._nodes.append((path, message))
+
+    def _add(self, error: ValidationError, path: tuple, field) -> None:
+        """
+        Insert an error under a path of the tree, walking children of group errors.
+
+        """
+        if error.is_logic_error:
+            self._insert_messages(path, error, field)
+
+            for i, definition_errors in error.definitions_errors.items():
+                node = path + (f"{error.rule} definition {i}",)
+
+                for child_error in definition_errors:
+                    relative_path = child_error.document_path[
+                        len(error.document_path) :
+                    ]
+                    self._add(child_error, node + relative_path, field)
+        elif error.is_group_error:
+            for child_error in error.child_errors:
+                relative_path = child_error.document_path[len(error.document_path) :]
+                self._add(child_error, path + relative_path, child_error.field)
+        elif error.code in self.messages:
+            self._insert_messages(path, error, field)
+
+    def _insert_messages(self, path: tuple, error: ValidationError, field) -> None:
+        """
+        Insert messages defined by a user, or the message of Cerberus if there is no record.
+
+        """
+        messages = tuple(
+            self._converter.convert_message(error, message)
+            for message in self._converter.find_messages(
+                error.document_path, error.code
+            )
+        )
+
+        if messages == ():
+            self._report_error(NO_RECORD, path=error.document_path, code=error.code)
+
+        if None in messages:
+            for message in self._converter.find_messages(
+                error.document_path, error.code
+            ):
+                for attr in self._converter.invalid_attributes(error, message):
+                    self._report_error(
+                        INVALID_EXPRESSION,
+                        path=error.document_path,
+                        code=error.code,
+                        attr=attr,
+                    )
+
+        if (messages == ()) or (None in messages):
+            messages = (self._format_message(field, error),)
+
+        for message in messages:
+            self._insert_error(path, message)
+            self._nodes.append((path, message))
+
+    def _insert_error(self, path: tuple, node: Union[str, dict]) -> None:
+        """
+        Add an error to the tree in place, without creating temporary handlers for subtrees.
+
+        """
+        tree = self.tree
+
+        for field in path[:-1]:
+            if field not in tree:
+                tree[field] = [{}]
+            tree = tree[field][-1]
+
+        if path[-1] in tree:
+            tree[path[-1]].insert(-1, node)
+        else:
+            tree[path[-1]] = [node, {}]
+
+    def _report_error(self, kind: str, **details) -> None:
+        """
+        Notify occurred errors.
+
+        """
+        self._any_error = True
+        self._diagnostics.report(kind, **details)
+
+    @property
+    def any_error(self) -> bool:
+        """
+        Check whether any error occurred while translating Cerberus's errors.
+
+        Returns
+        -------
+        bool : False if no errors, otherwise True.
+
+        """
+        return self._any_error or self._converter.any_error
+
+    @property
+    def error_list(self) -> list:
+        """
+        Get list of errors which occurred during translating Cerberus's errors into user-defined messages.
+
+        Returns
+        -------
+        list : List of messages.
+
+        """
+        return self._converter.error_list + self._diagnostics.messages
+
+
+class TranslatingValidator(Validator):
+    """
+    TranslatingValidator is a Cerberus Validator whose errors are already translated.
+
+    The file with customized messages is passed as path_to_file keyword argument and optional
+    formats of attributes as formats keyword argument, e.g.:
+    TranslatingValidator(schema, path_to_file="msgs.txt").
+
+    Only the root validator translates errors. Cerberus collects errors of child validators with its
+    own handlers and passes them to the root one, so the catalog is read once per root validator.
+
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        """
+        Initialize an object. Child validators created by Cerberus keep their own handlers.
+
+        """
+        if ("error_handler" not in kwargs) and (not kwargs.get("is_child")):
+            kwargs["error_handler"] = (
+                TranslatingErrorHandler,
+                {
+                    "path_to_file": kwargs.get("path_to_file"),
+                    "formats": kwargs.get("formats"),
+                },
+            )
+
+        super().__init__(*args, **kwargs)
@@ -1,12 +1,47 @@
 """
-The module contains PathFinder class which goes through dictionary of errors and gets all paths to elements.
+The module contains PathFinder class which goes through dictionary of errors and gets all paths to elements,
+and walk_error_tree function which gets them directly from the error tree of Cerberus.
 
 """
 
 from copy import deepcopy
 from functools import reduce
 from operator import getitem
-from typing import Any, Hashable, Union
+from typing import Any, Hashable, Iterable, Iterator, Union
+
+from cerberus.errors import ErrorTree
+
+
+def walk_error_tree(tree: ErrorTree, exclude: Iterable[tuple] = ()) -> Iterator[tuple]:
+    """
+    Walk through an error tree of Cerberus (e.g. validator.document_error_tree) once.
+
+    Children of group errors (anyof, oneof, schema, items, ...) are stored by Cerberus under their own
+    paths, so every error is visited exactly once and no dictionary of messages is built or copied.
+
+    Parameters
+    ----------
+    tree : An error tree of Cerberus or its node.
+    exclude : Paths of nodes which are skipped together with their descendants.
+
+    Returns
+    -------
+    Iterator : Pairs (path):(list of errors) for all nodes with errors, parents before children.
+
+    """
+    nodes = [tree]
+    exclude = set(exclude)
+
+    while nodes != []:
+        node = nodes.pop()
+
+        if node.path in exclude:
+            continue
+
+        if len(node.errors) > 0:
+            yield node.path, node.errors
+
+        nodes.extend(reversed(list(node.descendants.values())))
 
 
 class PathFinder:
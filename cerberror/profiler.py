@@ -0,0 +1,433 @@
+"""
+The module contains Profiler class which runs real workloads through Translator and measures its phases,
+and AllocationTracker class which measures memory allocated by the phases.
+
+"""
+
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from heapq import nlargest
+from pathlib import Path
+from time import perf_counter
+from typing import ContextManager, Iterable, Iterator, Optional, Union
+
+from cerberus import Validator
+from cerberus.errors import ValidationError
+
+from cerberror.trans import Translator
+
+PHASES = ("validate", "parse", "paths", "lookup", "matching", "rendering")
+
+
+class AllocationTracker:
+    """
+    AllocationTracker measures peak and retained memory of phases with tracemalloc.
+
+    Used as a context manager, it starts tracing memory on entering and stops it on exiting, unless
+    tracing has already been started by someone else. Measurements can be nested. Peaks are measured
+    only on Python 3.9 and newer, older versions report retained bytes instead.
+
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an object.
+
+        """
+        self._allocations = dict()
+        self._frames = list()
+        self._started = False
+
+    def __enter__(self) -> "AllocationTracker":
+        """
+        Start tracing memory allocations.
+
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started = True
+
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Stop tracing memory allocations if they have been started by the object.
+
+        """
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """
+        Measure memory allocated within a block. It does nothing if memory is not traced.
+
+        Parameters
+        ----------
+        phase : A name of a phase. Measurements of the same phase are accumulated.
+
+        """
+        if not tracemalloc.is_tracing():
+            yield
+            return
+
+        current, peak = tracemalloc.get_traced_memory()
+
+        if self._frames != []:
+            self._frames[-1][1] = max(self._frames[-1][1], peak)
+
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+
+        frame = [current, current]
+        self._frames.append(frame)
+
+        try:
+            yield
+        finally:
+            self._frames.pop()
+            current, peak = tracemalloc.get_traced_memory()
+
+            if hasattr(tracemalloc, "reset_peak"):
+                frame[1] = max(frame[1], peak)
+            else:
+                frame[1] = max(frame[1], current)
+
+            if self._frames != []:
+                self._frames[-1][1] = max(self._frames[-1][1], frame[1])
+
+            entry = self._allocations.setdefault(phase, [0, 0, 0])
+            entry[0] = max(entry[0], frame[1] - frame[0])
+            entry[1] += current - frame[0]
+            entry[2] += 1
+
+    @property
+    def allocations(self) -> dict:
+        """
+        Get memory allocated by phases.
+
+        Returns
+        -------
+        dict : A dictionary composed of pairs (phase):(peak bytes, retained bytes, number of calls).
+               Peak is the highest one of a single call. Retained bytes are the net change of traced
+               memory summed up over calls, negative if a phase frees more than it allocates.
+
+        """
+        return {phase: tuple(entry) for phase, entry in self._allocations.items()}
+
+
+class ProfilingTranslator(Translator):
+    """
+    ProfilingTranslator is a Translator which accumulates time spent in every phase of the translation.
+
+    """
+
+    def __init__(
+        self,
+        validator: Validator,
+        path_to_file: Union[str, Path],
+        timings: dict = None,
+        tracker: Optional[AllocationTracker] = None,
+    ) -> None:
+        """
+        Initialize an object and measure time of parsing a file with customized messages.
+
+        Parameters
+        ----------
+        validator : Cerberus object.
+        path_to_file : A name of the file storing customized error messages.
+        timings : A dictionary accumulating time of phases. A new one is created if None.
+        tracker : AllocationTracker object measuring memory allocated by phases. The default is None,
+                  which means memory is not measured.
+
+        """
+        self._timings = dict.fromkeys(PHASES, 0.0) if timings is None else timings
+        self._tracker = tracker
+
+        with self._measure("parse"):
+            super().__init__(validator, path_to_file)
+
+    @contextmanager
+    def _measure(self, phase: str) -> Iterator[None]:
+        """
+        Measure time and, if a tracker is given, memory of a phase.
+
+        """
+        start = perf_counter()
+
+        if self._tracker is None:
+            yield
+        else:
+            with self._tracker.measure(phase):
+                yield
+
+        self._timings[phase] += perf_counter() - start
+
+    def _get_paths(self) -> tuple:
+        """
+        Measure time of finding paths.
+
+        """
+        with self._measure("paths"):
+            return super()._get_paths()
+
+    def _fetch_errors(self, path: tuple) -> list:
+        """
+        Measure time of fetching errors from the tree of Cerberus.
+
+        """
+        with self._measure("lookup"):
+            return super()._fetch_errors(path)
+
+    def _match_records(self, path: tuple, code: int) -> tuple:
+        """
+        Measure time of matching records.
+
+        """
+        with self._measure("matching"):
+            return super()._match_records(path, code)
+
+    def _convert_message(self, error: ValidationError, message: str) -> str:
+        """
+        Measure time of rendering a message.
+
+        """
+        with self._measure("rendering"):
+            return super()._convert_message(error, message)
+
+    @Translator.validator.setter
+    def validator(self, new_validator: Validator) -> None:
+        """
+        Setter for validator. Timings keep accumulating.
+
+        """
+        self.__init__(new_validator, self._path_to_file, self._timings, self._tracker)
+
+    @Translator.path_to_file.setter
+    def path_to_file(self, new_path_to_file) -> None:
+        """
+        Setter for path_to_file. Timings keep accumulating.
+
+        """
+        self.__init__(self._validator, new_path_to_file, self._timings, self._tracker)
+
+    @property
+    def timings(self) -> dict:
+        """
+        Get time spent in every phase of the translation.
+
+        Returns
+        -------
+        dict : A dictionary composed of pairs (phase):(seconds).
+
+        """
+        return self._timings
+
+
+class Profiler:
+    """
+    Profiler validates and translates documents and collects statistics about phases of the translation.
+
+    """
+
+    def __init__(
+        self,
+        schema: dict,
+        path_to_file: Union[str, Path],
+        top: int = 5,
+        track_allocations: bool = False,
+    ) -> None:
+        """
+        Initialize an object.
+
+        Parameters
+        ----------
+        schema : Cerberus schema used to validate documents.
+        path_to_file : A name of the file storing customized error messages.
+        top : A number of the slowest documents to remember. The default is 5.
+        track_allocations : Measure memory allocated by phases and documents with tracemalloc.
+                            It slows down processing. The default is False.
+
+        """
+        self._validator = Validator(schema)
+        self._path_to_file = Path(path_to_file)
+        self._top = top
+        self._tracker = AllocationTracker() if track_allocations else None
+        self._timings = dict.fromkeys(PHASES, 0.0)
+        self._durations = list()
+        self._invalid = 0
+        self._failed = 0
+        self._elapsed = 0.0
+
+    def run(self, documents: Iterable[dict]) -> "Profiler":
+        """
+        Validate and translate documents one by one.
+
+        Parameters
+        ----------
+        documents : An iterable of documents.
+
+        Returns
+        -------
+        Profiler : The object itself, so the report can be printed at once.
+
+        """
+        if self._tracker is None:
+            self._run(documents)
+        else:
+            with self._tracker:
+                self._run(documents)
+
+        return self
+
+    def _run(self, documents: Iterable[dict]) -> None:
+        """
+        Validate and translate documents, measuring them one by one.
+
+        """
+        for index, document in enumerate(documents, start=len(self._durations)):
+            start = perf_counter()
+
+            with self._measure("document"):
+                with self._measure("validate"):
+                    self._validator.validate(document)
+
+                self._timings["validate"] += perf_counter() - start
+
+                if self._validator.errors:
+                    self._invalid += 1
+                    translator = ProfilingTranslator(
+                        self._validator,
+                        self._path_to_file,
+                        self._timings,
+                        self._tracker,
+                    )
+                    translator.translate()
+                    self._failed += translator.any_error
+
+            duration = perf_counter() - start
+            self._durations.append((duration, index))
+            self._elapsed += duration
+
+    def _measure(self, phase: str) -> ContextManager:
+        """
+        Measure memory of a phase if allocations are tracked.
+
+        """
+        if self._tracker is None:
+            return nullcontext()
+
+        return self._tracker.measure(phase)
+
+    @property
+    def timings(self) -> dict:
+        """
+        Get total time spent in every phase.
+
+        Returns
+        -------
+        dict : A dictionary composed of pairs (phase):(seconds).
+
+        """
+        return self._timings
+
+    @property
+    def allocations(self) -> dict:
+        """
+        Get memory allocated by phases and documents ("document" key).
+
+        Returns
+        -------
+        dict : A dictionary composed of pairs (phase):(peak bytes, retained bytes, number of calls).
+               Empty if allocations are not tracked.
+
+        """
+        return self._tracker.allocations if self._tracker is not None else dict()
+
+    @property
+    def peak_per_document(self) -> int:
+        """
+        Get the highest peak of memory allocated while validating and translating a single document.
+
+        Returns
+        -------
+        int : A number of bytes. Zero if allocations are not tracked.
+
+        """
+        return self.allocations.get("document", (0,))[0]
+
+    @property
+    def documents(self) -> int:
+        """
+        Get a number of processed documents.
+
+        Returns
+        -------
+        int : A number of documents.
+
+        """
+        return len(self._durations)
+
+    @property
+    def throughput(self) -> float:
+        """
+        Get a number of documents processed per second.
+
+        Returns
+        -------
+        float : Documents per second. Zero if nothing has been measured.
+
+        """
+        return self.documents / self._elapsed if self._elapsed > 0 else 0.0
+
+    @property
+    def slowest(self) -> list:
+        """
+        Get the slowest documents.
+
+        Returns
+        -------
+        list : A list of pairs (index of document, seconds) sorted from the slowest one.
+
+        """
+        return [
+            (index, duration)
+            for duration, index in nlargest(self._top, self._durations)
+        ]
+
+    def report(self) -> str:
+        """
+        Prepare a human readable summary of measurements.
+
+        Returns
+        -------
+        str : A multiline report.
+
+        """
+        total = sum(self._timings.values())
+        lines = [
+            f"documents: {self.documents} (invalid: {self._invalid}, "
+            f"not translated: {self._failed})",
+            f"elapsed: {self._elapsed:.6f} s",
+            f"throughput: {self.throughput:.1f} docs/s",
+            "",
+            f"{'phase':<12}{'seconds':>12}{'share':>9}",
+        ]
+
+        for phase, seconds in self._timings.items():
+            share = 100 * seconds / total if total > 0 else 0.0
+            lines.append(f"{phase:<12}{seconds:>12.6f}{share:>8.1f}%")
+
+        if self._tracker is not None:
+            lines.extend(["", f"{'phase':<12}{'peak KiB':>12}{'retained KiB':>14}"])
+
+            for phase, (peak, retained, _) in self.allocations.items():
+                lines.append(f"{phase:<12}{peak / 1024:>12.1f}{retained / 1024:>14.1f}")
+
+        lines.extend(["", "slowest documents:"])
+        lines.extend(
+            f"  #{index}: {duration:.6f} s" for index, duration in self.slowest
+        )
+
+        return "\n".join(lines)
@@ -0,0 +1,288 @@
+"""
+The module contains tools translating serialized errors of Cerberus without a live Validator.
+
+Validation nodes dump errors with dump_errors function, send them as plain (JSON or pickle) records,
+and translators process them in bulk with RecordTranslator class or translate_records function.
+
+"""
+
+from pathlib import Path
+from typing import Any, Iterable, List, NamedTuple, Optional, Union
+
+from cerberus import Validator
+from cerberus.errors import ERROR_GROUP, LOGICAL, ValidationError
+
+from cerberror.diagnostics import NO_PATH
+from cerberror.errors import ErrConverter
+from cerberror.paths import PathFinder
+from cerberror.trans import FLAT, Translator
+
+
+class ErrorRecord(NamedTuple):
+    """
+    ErrorRecord is a compact and picklable counterpart of ValidationError.
+
+    """
+
+    document_path: tuple
+    code: int
+    rule: Optional[str] = None
+    constraint: Any = None
+    value: Any = None
+    info: tuple = ()
+    child_errors: tuple = ()
+
+    @property
+    def is_group_error(self) -> bool:
+        """
+        Check whether the record is a group error, e.g. of anyof or schema rules.
+
+        Returns
+        -------
+        bool : True if the code belongs to the group of errors, otherwise False.
+
+        """
+        return bool(self.code & ERROR_GROUP.code)
+
+    @property
+    def is_logic_error(self) -> bool:
+        """
+        Check whether the record is an error of logic rules (anyof, oneof, allof, noneof).
+
+        Returns
+        -------
+        bool : True if the code belongs to the group of logic errors, otherwise False.
+
+        """
+        return bool(self.code & (LOGICAL.code - ERROR_GROUP.code))
+
+    @property
+    def field(self) -> Any:
+        """
+        Get field of the contextual mapping.
+
+        Returns
+        -------
+        Any : The last element of the path, None if the path is empty.
+
+        """
+        return self.document_path[-1] if self.document_path else None
+
+    @classmethod
+    def from_error(
+        cls, error: ValidationError, path: Optional[tuple] = None
+    ) -> "ErrorRecord":
+        """
+        Create a record from an error of Cerberus.
+
+        Parameters
+        ----------
+        error : ValidationError object from Cerberus.
+        path : Path under which the error is stored. The default is the document path of the error.
+
+        Returns
+        -------
+        ErrorRecord : A record. Information about child errors of group errors is skipped, but child
+                      errors of nested rules (schema, items, ...) are kept as records, because Cerberus
+                      shows them instead of the group error.
+
+        """
+        nested_group = error.is_group_error and (not error.is_logic_error)
+
+        return cls(
+            error.document_path if path is None else path,
+            error.code,
+            error.rule,
+            error.constraint,
+            error.value,
+            () if error.is_group_error else tuple(error.info),
+            tuple(cls.from_error(i) for i in error.child_errors) if nested_group else (),
+        )
+
+    @classmethod
+    def from_dict(cls, record: dict) -> "ErrorRecord":
+        """
+        Create a record from a dictionary, e.g. decoded from JSON.
+
+        Parameters
+        ----------
+        record : A dictionary with "document_path" and "code" keys, optionally "rule", "constraint",
+                 "value", "info" and "child_errors".
+
+        Returns
+        -------
+        ErrorRecord : A record with tuples in place of lists for the path, the information and child errors.
+
+        """
+        record = dict(record)
+        record["document_path"] = tuple(record["document_path"])
+        record["info"] = tuple(record.get("info", ()))
+        record["child_errors"] = tuple(
+            i if isinstance(i, ErrorRecord) else cls.from_dict(i)
+            for i in record.get("child_errors", ())
+        )
+
+        return cls(**record)
+
+    def to_dict(self) -> dict:
+        """
+        Convert a record into a dictionary.
+
+        Returns
+        -------
+        dict : A dictionary with a list in place of the path, ready to be serialized to JSON.
+
+        """
+        record = self._asdict()
+        record["document_path"] = list(self.document_path)
+        record["info"] = list(self.info)
+        record["child_errors"] = [i.to_dict() for i in self.child_errors]
+
+        return record
+
+
+def dump_errors(validator: Validator) -> List[dict]:
+    """
+    Dump errors of a validator to plain records accepted by RecordTranslator.
+
+    Parameters
+    ----------
+    validator : Cerberus object which has validated a document.
+
+    Returns
+    -------
+    list : A list of dictionaries. Each of them describes one error under the same path which
+           Translator uses to match records of a file. Values are kept as they are, so JSON turns
+           tuples into lists and messages of Cerberus rendered from decoded records may differ.
+
+    """
+    records = list()
+
+    if not validator.errors:
+        return records
+
+    for path in PathFinder(validator.errors).paths:
+        for error in validator.document_error_tree.fetch_errors_from(path):
+            records.append(ErrorRecord.from_error(error, path).to_dict())
+
+    return records
+
+
+class RecordTranslator(Translator):
+    """
+    RecordTranslator translates serialized errors with the same matching and rendering as Translator.
+
+    """
+
+    def __init__(
+        self,
+        records: Iterable[Union[dict, ErrorRecord]],
+        path_to_file: Union[str, Path],
+        formats: Optional[dict] = None,
+        converter: Optional[ErrConverter] = None,
+    ) -> None:
+        """
+        Initialize an object.
+
+        Parameters
+        ----------
+        records : Errors as dictionaries (see dump_errors) or ErrorRecord objects.
+        path_to_file : A name of the file storing customized error messages.
+        formats : A dictionary composed of pairs (attribute name):(AttributeFormat).
+        converter : ErrConverter object already reading path_to_file. It can be shared by many translators.
+
+        """
+        self._errors_by_path = dict()
+
+        for record in records:
+            if not isinstance(record, ErrorRecord):
+                record = ErrorRecord.from_dict(record)
+
+            self._errors_by_path.setdefault(record.document_path, []).append(record)
+
+        super().__init__(None, path_to_file, formats, converter)
+
+    def _get_paths(self) -> tuple:
+        """
+        Get paths of all records within subtrees to translate.
+
+        """
+        self._paths = tuple(path for path in self._errors_by_path if self._in_scope(path))
+
+        if self._paths == ():
+            self._report_error(NO_PATH)
+
+        return self._paths
+
+    def _fetch_errors(self, path: tuple) -> list:
+        """
+        Fetch records assigned to a path.
+
+        """
+        return self._errors_by_path[path]
+
+    def _original_errors(self) -> dict:
+        """
+        Get messages of Cerberus for all records, in the layout of Cerberus.
+
+        """
+        errors = dict()
+
+        for path, records in self._errors_by_path.items():
+            if self._in_scope(path):
+                errors[path] = [self._format_message(record) for record in records]
+
+        return self._nest(errors)
+
+    @Translator.validator.setter
+    def validator(self, new_validator: Validator) -> None:
+        """
+        Setter for validator. Records are not bound to a validator, so it cannot be replaced.
+
+        """
+        raise AttributeError(
+            "RecordTranslator has no validator, pass dump_errors(validator) to a new object"
+        )
+
+    @Translator.path_to_file.setter
+    def path_to_file(self, new_path_to_file) -> None:
+        """
+        Setter for path_to_file.
+
+        """
+        records = [
+            record for records in self._errors_by_path.values() for record in records
+        ]
+        self.__init__(records, new_path_to_file, self._formats)
+
+
+def translate_records(
+    batches: Iterable[Iterable[Union[dict, ErrorRecord]]],
+    path_to_file: Union[str, Path],
+    sep: str = " -> ",
+    shape: str = FLAT,
+    formats: Optional[dict] = None,
+) -> List[dict]:
+    """
+    Translate many batches of serialized errors, reading the file with customized messages only once.
+
+    Parameters
+    ----------
+    batches : An iterable of batches. Each batch contains errors of one document.
+    path_to_file : A name of the file storing customized error messages.
+    sep : A string separator between elements in paths. The default is " -> ".
+    shape : Shape of results, see Translator.translate.
+    formats : A dictionary composed of pairs (attribute name):(AttributeFormat).
+
+    Returns
+    -------
+    list : Translated errors, one dictionary per batch. A batch which cannot be translated is returned
+           with messages of Cerberus.
+
+    """
+    converter = ErrConverter(path_to_file, formats)
+
+    return [
+        RecordTranslator(batch, path_to_file, formats, converter).translate(sep, shape)
+        for batch in batches
+    ]
@@ -0,0 +1,265 @@
+"""
+The module contains Registry class which translates errors of many schemas, each with its own file
+of customized messages.
+
+"""
+
+import hashlib
+from pathlib import Path
+from typing import Any, Mapping, NamedTuple, Optional, Union
+
+from cerberus import Validator
+
+from cerberror.errors import ErrConverter
+from cerberror.trans import FLAT, Translator
+
+SCHEMA_CACHE_SIZE = 1024
+
+
+class Entry(NamedTuple):
+    """
+    A schema registered in Registry.
+
+    name : A name of the schema.
+    key : A hash of the schema.
+    converter : ErrConverter object reading the file with customized messages of the schema.
+
+    """
+
+    name: str
+    key: str
+    converter: ErrConverter
+
+
+def _canonical(value: Any) -> Any:
+    """
+    Convert a schema into a structure whose repr() does not depend on order of keys.
+
+    """
+    if isinstance(value, Mapping):
+        return tuple(sorted((repr(k), _canonical(v)) for k, v in value.items()))
+
+    if isinstance(value, (list, tuple)):
+        return tuple(_canonical(i) for i in value)
+
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(repr(i) for i in value))
+
+    return value
+
+
+def schema_key(schema: Mapping) -> str:
+    """
+    Compute a hash of a schema.
+
+    Parameters
+    ----------
+    schema : A schema of Cerberus, e.g. validator.schema.
+
+    Returns
+    -------
+    str : A hexadecimal digest. Equal schemas have equal digests regardless of order of keys.
+
+    """
+    return hashlib.sha1(repr(_canonical(schema)).encode()).hexdigest()
+
+
+class Registry:
+    """
+    Registry maps schemas to files with customized messages read once, in advance.
+
+    A validator is dispatched to its schema by a name given explicitly or by a hash of validator.schema.
+    The hash is computed once per schema mapping, so validators created from the registered dictionary
+    are dispatched without hashing. Only mappings are remembered, never validators. A registered
+    dictionary modified afterwards must be registered again. Schemas sharing a file and formats share
+    one ErrConverter.
+
+    """
+
+    def __init__(self) -> None:
+        """
+        Initialize an object.
+
+        """
+        self._entries = dict()
+        self._keys = dict()
+        self._converters = dict()
+        self._schemas = dict()
+
+    def register(
+        self,
+        name: str,
+        schema: Mapping,
+        path_to_file: Union[str, Path],
+        formats: Optional[dict] = None,
+    ) -> Entry:
+        """
+        Register a schema and read its file with customized messages.
+
+        Parameters
+        ----------
+        name : A name of the schema.
+        schema : A schema of Cerberus (a dictionary or validator.schema).
+        path_to_file : A name of the file storing customized error messages.
+        formats : A dictionary composed of pairs (attribute name):(AttributeFormat).
+
+        Returns
+        -------
+        Entry : The registered schema.
+
+        """
+        mapping = Validator(schema).schema.schema
+        formats_key = tuple(sorted((formats or dict()).items()))
+        converter_key = (Path(path_to_file).resolve(), formats_key)
+
+        if converter_key not in self._converters:
+            self._converters[converter_key] = ErrConverter(path_to_file, formats)
+
+        converter = self._converters[converter_key]
+        converter.load_shards(mapping)
+        entry = Entry(name, schema_key(mapping), converter)
+
+        if name in self._entries:
+            self._forget(name)
+
+        self._entries[name] = entry
+        self._keys[entry.key] = name
+        self._schemas[id(mapping)] = (mapping, name)
+
+        return entry
+
+    def _forget(self, name: str) -> None:
+        """
+        Forget the hash of a schema registered under a name. The hash is passed to another schema
+        registered with it, if any.
+
+        """
+        key = self._entries[name].key
+        self._schemas.clear()
+
+        if self._keys.get(key) == name:
+            del self._keys[key]
+
+            for other in self._entries.values():
+                if (other.name != name) and (other.key == key):
+                    self._keys[key] = other.name
+
+    def entry(self, validator: Validator, name: Optional[str] = None) -> Entry:
+        """
+        Find the registered schema of a validator.
+
+        Parameters
+        ----------
+        validator : Cerberus object.
+        name : A name of the schema. The default is None, which means the schema is found by its hash.
+
+        Returns
+        -------
+        Entry : The registered schema.
+
+        """
+        if name is not None:
+            return self._entries[name]
+
+        mapping = getattr(validator.schema, "schema", validator.schema)
+        cached = self._schemas.get(id(mapping))
+
+        if (cached is None) or (cached[0] is not mapping):
+            if len(self._schemas) >= SCHEMA_CACHE_SIZE:
+                self._schemas.clear()
+
+            key = schema_key(mapping) if mapping is not None else None
+
+            if key not in self._keys:
+                raise KeyError("Schema of the validator has not been registered")
+
+            cached = self._schemas[id(mapping)] = (mapping, self._keys[key])
+
+        return self._entries[cached[1]]
+
+    def translator(
+        self, validator: Validator, name: Optional[str] = None
+    ) -> Translator:
+        """
+        Create a translator using the prebuilt converter of a schema.
+
+        Parameters
+        ----------
+        validator : Cerberus object which has validated a document.
+        name : A name of the schema. The default is None, which means the schema is found by its hash.
+
+        Returns
+        -------
+        Translator : A translator.
+
+        """
+        converter = self.entry(validator, name).converter
+
+        return Translator(validator, converter.path_to_file, converter=converter)
+
+    def translate(
+        self,
+        validator: Validator,
+        name: Optional[str] = None,
+        sep: str = " -> ",
+        shape: str = FLAT,
+    ) -> dict:
+        """
+        Translate errors of a validator with the file of its schema.
+
+        Parameters
+        ----------
+        validator : Cerberus object which has validated a document.
+        name : A name of the schema. The default is None, which means the schema is found by its hash.
+        sep : A string separator between elements in paths. The default is " -> ".
+        shape : Shape of the result, see Translator.translate.
+
+        Returns
+        -------
+        dict : Translated errors or errors generated by Cerberus if the translation fails.
+
+        """
+        return self.translator(validator, name).translate(sep, shape)
+
+    def footprint(self) -> dict:
+        """
+        Estimate memory used by parsed files of registered schemas.
+
+        Returns
+        -------
+        dict : A dictionary composed of pairs (name of a schema):(number of bytes). A converter shared
+               by many schemas is counted for each of them.
+
+        """
+        footprint = dict()
+
+        for name, entry in self._entries.items():
+            footprint[name] = entry.converter.footprint()
+
+        return footprint
+
+    def __contains__(self, name: str) -> bool:
+        """
+        Check whether a schema has been registered under a name.
+
+        """
+        return name in self._entries
+
+    def __len__(self) -> int:
+        """
+        Get a number of registered schemas.
+
+        """
+        return len(self._entries)
+
+    @property
+    def names(self) -> tuple:
+        """
+        Get names of registered schemas.
+
+        Returns
+        -------
+        tuple : Names in order of registration.
+
+        """
+        return tuple(self._entries)
@@ -0,0 +1,253 @@
+"""
+The module contains Aggregator class which summarizes errors of many documents validated by Cerberus.
+
+"""
+
+from pathlib import Path
+from typing import Iterable, Optional, Union
+
+from cerberus import Validator
+from cerberus.errors import ValidationError
+
+from cerberror.diagnostics import INVALID_EXPRESSION, NO_RECORD, Diagnostics
+from cerberror.errors import ErrConverter, find_attributes
+from cerberror.paths import PathFinder
+from cerberror.trans import Translator
+
+
+class Aggregator:
+    """
+    Aggregator collects errors of many rows (documents) and renders each unique error only once.
+
+    An error is unique by its path without list indexes, its code, its predefined message and values
+    of attributes used by the message. Errors without a record are counted under messages of Cerberus.
+
+    """
+
+    def __init__(
+        self,
+        path_to_file: Union[str, Path],
+        sample_size: int = 5,
+        formats: Optional[dict] = None,
+    ) -> None:
+        """
+        Initialize an object.
+
+        Parameters
+        ----------
+        path_to_file : A name of the file storing customized error messages.
+        sample_size : Maximal number of row indexes remembered per unique error. The default is 5.
+        formats : A dictionary composed of pairs (attribute name):(AttributeFormat).
+
+        """
+        self._path_to_file = Path(path_to_file)
+        self._converter = ErrConverter(self._path_to_file, formats)
+        self._sample_size = sample_size
+        self._entries = dict()
+        self._missing = dict()
+        self._rows = 0
+        self._any_error = False
+        self._diagnostics = Diagnostics(self._converter.path_to_file)
+
+    @staticmethod
+    def strip_indexes(path: tuple) -> tuple:
+        """
+        Remove list indexes from a path.
+
+        Parameters
+        ----------
+        path : Path to an element.
+
+        Returns
+        -------
+        tuple : Path composed of keys which are not integers.
+
+        """
+        return tuple(key for key in path if not isinstance(key, int))
+
+    def add(self, row: int, validator: Validator) -> None:
+        """
+        Add errors of a validated row.
+
+        Parameters
+        ----------
+        row : Index of a row.
+        validator : Cerberus object which has just validated the row.
+
+        """
+        self._rows += 1
+
+        if not validator.errors:
+            return
+
+        tree = validator.document_error_tree
+
+        for path in PathFinder(validator.errors).paths:
+            for error in tree.fetch_errors_from(path):
+                messages = self._converter.find_messages(path, error.code)
+
+                if messages == ():
+                    self._report_error(NO_RECORD, path=path, code=error.code)
+
+                    if not Translator._is_nested_group(error):
+                        self._add_missing(row, path, error)
+
+                for message in messages:
+                    self._add_error(row, path, error, message)
+
+    def run(self, validator: Validator, rows: Iterable[dict]) -> "Aggregator":
+        """
+        Validate rows one by one and add their errors.
+
+        Parameters
+        ----------
+        validator : Cerberus object.
+        rows : An iterable of documents.
+
+        Returns
+        -------
+        Aggregator : The object itself.
+
+        """
+        for row, document in enumerate(rows):
+            validator.validate(document)
+            self.add(row, validator)
+
+        return self
+
+    def _add_error(
+        self, row: int, path: tuple, error: ValidationError, message: str
+    ) -> None:
+        """
+        Count an error and render its message if it has not been seen yet.
+
+        """
+        values = tuple(
+            (
+                self._converter.format_attribute(error, attr)
+                if hasattr(error, attr)
+                else None
+            )
+            for attr in find_attributes(message)
+        )
+        key = (self.strip_indexes(path), error.code, message, values)
+        entry = self._entries.get(key)
+
+        if entry is None:
+            text = self._converter.convert_message(error, message)
+
+            if text is None:
+                for attr in self._converter.invalid_attributes(error, message):
+                    self._report_error(
+                        INVALID_EXPRESSION, path=path, code=error.code, attr=attr
+                    )
+
+            self._entries[key] = entry = [text, 0, list()]
+
+        self._count(entry, row)
+
+    def _add_missing(self, row: int, path: tuple, error: ValidationError) -> None:
+        """
+        Count an error without a record under a message of Cerberus.
+
+        """
+        path = self.strip_indexes(path)
+        message = Translator._format_message(error)
+        key = (path, error.code, None, (message,))
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self._missing.setdefault((path, error.code), None)
+            self._entries[key] = entry = [message, 0, list()]
+
+        self._count(entry, row)
+
+    def _count(self, entry: list, row: int) -> None:
+        """
+        Count an occurrence of an error and remember its row if the sample is not full.
+
+        """
+        entry[1] += 1
+        rows = entry[2]
+
+        if (len(rows) < self._sample_size) and ((rows == []) or (rows[-1] != row)):
+            rows.append(row)
+
+    def _report_error(self, kind: str, **details) -> None:
+        """
+        Notify occurred errors.
+
+        """
+        self._any_error = True
+        self._diagnostics.report(kind, **details)
+
+    def report(self, sep: str = " -> ") -> dict:
+        """
+        Summarize collected errors.
+
+        Parameters
+        ----------
+        sep : A string separator between elements in paths. The default is " -> ".
+
+        Returns
+        -------
+        dict : A dictionary composed of pairs (path without indexes):(list of unique errors). Each unique
+               error is a dictionary with "message", "code", "count" and "rows" (a sample of row indexes).
+
+        """
+        report = dict()
+
+        for (path, code, _, _), (message, count, rows) in self._entries.items():
+            report.setdefault(sep.join(map(str, path)), []).append(
+                {"message": message, "code": code, "count": count, "rows": list(rows)}
+            )
+
+        return report
+
+    @property
+    def rows(self) -> int:
+        """
+        Get a number of added rows.
+
+        Returns
+        -------
+        int : A number of rows.
+
+        """
+        return self._rows
+
+    @property
+    def missing(self) -> tuple:
+        """
+        Get errors counted under messages of Cerberus.
+
+        Returns
+        -------
+        tuple : Pairs (path without indexes, code) without a record.
+
+        """
+        return tuple(self._missing)
+
+    @property
+    def any_error(self) -> bool:
+        """
+        Check whether any error occurred while converting Cerberus's errors.
+
+        Returns
+        -------
+        bool : False if no errors, otherwise True.
+
+        """
+        return self._any_error or self._converter.any_error
+
+    @property
+    def error_list(self) -> list:
+        """
+        Get list of errors which occurred during converting Cerberus's errors into user-defined messages.
+
+        Returns
+        -------
+        list : List of messages.
+
+        """
+        return self._converter.error_list + self._diagnostics.messages
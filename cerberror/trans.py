@@ -3,13 +3,41 @@ This module contains Translator class which translates errors generated by Cerbe
 
 """
 
+import json
+from functools import lru_cache
 from pathlib import Path
-from typing import Union
+from typing import BinaryIO, Iterable, Iterator, Optional, Union
 
 from cerberus import Validator
+from cerberus.errors import BasicErrorHandler, ValidationError
 
+from cerberror.diagnostics import INVALID_EXPRESSION, NO_PATH, NO_RECORD, Diagnostics
 from cerberror.errors import ErrConverter
-from cerberror.paths import PathFinder
+from cerberror.paths import PathFinder, walk_error_tree
+
+
+FLAT = "flat"
+TUPLE = "tuple"
+NESTED = "nested"
+SHAPES = (FLAT, TUPLE, NESTED)
+
+
+@lru_cache(maxsize=4096)
+def join_path(path: tuple, sep: str) -> str:
+    """
+    Join elements of a path into a key. Keys are cached per path and separator.
+
+    Parameters
+    ----------
+    path : Path to an element.
+    sep : A string separator between elements in paths.
+
+    Returns
+    -------
+    str : A key.
+
+    """
+    return sep.join(map(str, path))
 
 
 class Translator:
@@ -18,7 +46,14 @@ class Translator:
 
     """
 
-    def __init__(self, validator: Validator, path_to_file: Union[str, Path]) -> None:
+    def __init__(
+        self,
+        validator: Validator,
+        path_to_file: Union[str, Path],
+        formats: Optional[dict] = None,
+        converter: Optional[ErrConverter] = None,
+        expand_groups: bool = False,
+    ) -> None:
         """
         Initialize an object and trigger internal computations.
 
@@ -26,27 +61,57 @@ class Translator:
         ----------
         validator : Cerberus object.
         path_to_file : A name of the file storing customized error messages.
+        formats : A dictionary composed of pairs (attribute name):(AttributeFormat).
+        converter : ErrConverter object already reading path_to_file. It can be shared by many translators.
+        expand_groups : Take errors directly from the error tree of Cerberus instead of finding paths in
+                        validator.errors. Children of group errors are matched under their own paths,
+                        also below nodes with their own errors, and group errors of nested rules
+                        (schema, items, keysrules, ...) are matched only if a record exists.
+                        The default is False.
 
         """
         self._validator = validator
         self._path_to_file = Path(path_to_file)
-        self._converter = ErrConverter(self._path_to_file)
+        self._formats = formats
+
+        if converter is None:
+            converter = ErrConverter(self._path_to_file, formats)
+
+        self._converter = converter
+        self._expand_groups = expand_groups
+        self._nodes = None
+        self._scope = (None, ())
         self._any_error = False
-        self._error_list = list()
+        self._diagnostics = Diagnostics(self._path_to_file)
         self._paths = None
         self._records = None
         self._errors = dict()
+        self._missing = dict()
 
     def _get_paths(self) -> tuple:
         """
         Get paths to all errors produced by Cerberus.
 
         """
-        path_finder = PathFinder(self._validator.errors)
-        self._paths = path_finder.paths
+        only, exclude = self._scope
+
+        if self._expand_groups:
+            tree = self._validator.document_error_tree
+            roots = [tree] if only is None else [tree.fetch_node_from(path) for path in only]
+            self._nodes = dict()
+
+            for root in roots:
+                if (root is not None) and self._in_scope(root.path):
+                    self._nodes.update(walk_error_tree(root, exclude))
+
+            self._paths = tuple(self._nodes)
+        elif (only, exclude) != (None, ()):
+            self._paths = PathFinder(self._prune(self._validator.errors)).paths
+        else:
+            self._paths = PathFinder(self._validator.errors).paths
 
         if self._paths == ():
-            self._report_error("No path was found")
+            self._report_error(NO_PATH)
 
         return self._paths
 
@@ -59,71 +124,353 @@ class Translator:
 
         return self._records
 
-    def translate(self, sep: str = " -> ") -> dict:
+    def translate(
+        self,
+        sep: str = " -> ",
+        shape: str = FLAT,
+        partial: bool = False,
+        only: Optional[Iterable[tuple]] = None,
+        exclude: Optional[Iterable[tuple]] = None,
+    ) -> dict:
         """
         Translate errors generated by Cerberus into messages defined by a user.
 
         Parameters
         ----------
         sep : A string separator between elements in paths. The default is " -> ".
+        shape : Shape of the result:
+                - FLAT: keys are paths joined with sep (default),
+                - TUPLE: keys are paths (tuples), sep is not used,
+                - NESTED: nested dictionaries and lists with the layout of Cerberus's errors, except
+                  that messages of definitions of logic rules (anyof, oneof, ...) are listed
+                  together with messages of their field.
+        partial : Keep translated messages if some errors cannot be translated. Only those errors get
+                  messages of Cerberus and their paths and codes are listed by missing property.
+                  Group errors of nested rules (schema, items, ...) without a valid record are replaced
+                  by their child errors, as Cerberus does. The default is False.
+        only : Paths of subtrees to translate, e.g. [('billing',), ('items', 0)]. Other subtrees are
+               pruned before paths are found. The default is None, which means all errors.
+        exclude : Paths of subtrees not to translate. The default is None.
 
         Returns
         -------
         errors : If success, a result is a dictionary composed of pairs (path to element):(list of errors).
-                 Otherwise the returned value is an error container generated by Cerberus originally.
+                 Otherwise the returned value is an error container generated by Cerberus originally,
+                 pruned the same way if only or exclude is given.
 
         """
+        if shape not in SHAPES:
+            raise ValueError(f"Shape must be one of {SHAPES}, not '{shape}'")
+
+        self._set_scope(only, exclude)
+
+        if partial:
+            self._missing = dict()
+            self._errors = self._translate(sep, shape, partial)
+
+            return self._errors
+
         if self._converter.any_error or self._any_error:
-            self._report_error(*self._converter.error_list)
-            self._errors = self._validator.errors
+            self._errors = self._original_errors()
         else:
-            self._errors = self._translate(sep)
+            self._errors = self._translate(sep, shape)
 
-        if self._any_error:
-            self._errors = self._validator.errors
+        if self._converter.any_error or self._any_error:
+            self._errors = self._original_errors()
 
         return self._errors
 
-    def _translate(self, sep: str) -> dict:
+    def write_json(self, file: BinaryIO, sep: str = " -> ") -> None:
+        """
+        Translate errors and write them as JSON bytes directly to a file-like object.
+
+        Records and attributes used by messages are checked in a first pass which keeps nothing, then
+        messages are rendered again and written path by path. If the translation fails, errors
+        generated by Cerberus are written instead and any_error property is True. Written errors are
+        not kept, so errors property is not changed.
+
+        Parameters
+        ----------
+        file : A binary file-like object.
+        sep : A string separator between elements in paths. The default is " -> ".
+
+        """
+        if not (self._converter.any_error or self._any_error):
+            for path, pairs in self._match():
+                for error, message in pairs:
+                    self._check_message(path, error, message)
+
+        if self._converter.any_error or self._any_error:
+            file.write(json.dumps(self._original_errors(), default=str).encode())
+            return
+
+        file.write(b"{")
+
+        for i, (path, pairs) in enumerate(self._match()):
+            messages = [self._convert_message(error, message) for error, message in pairs]
+            file.write(b", " if i > 0 else b"")
+            file.write(f"{json.dumps(join_path(path, sep))}: {json.dumps(messages)}".encode())
+
+        file.write(b"}")
+
+    def _translate(self, sep: str, shape: str = FLAT, partial: bool = False) -> dict:
         """
-        Translate errors into defined messages.
+        Translate errors into defined messages. In the partial mode errors without a message get
+        messages of Cerberus.
 
         """
         errors = dict()
 
+        for path, pairs in self._match(partial):
+            key = path if shape != FLAT else join_path(path, sep)
+            messages = [
+                self._convert_message(error, message) if message is not None else None
+                for error, message in pairs
+            ]
+
+            for (error, message), text in zip(pairs, messages):
+                if (text is None) and (message is not None):
+                    self._check_message(path, error, message)
+
+            if partial and (None in messages):
+                for i, (error, _) in enumerate(pairs):
+                    if messages[i] is None:
+                        self._missing[(path, error.code)] = None
+                        messages[i] = self._format_message(error)
+
+            if key not in errors:
+                errors.update({key: messages})
+            else:
+                errors[key].extend(messages)
+
+        return errors if shape != NESTED else self._nest(errors)
+
+    def _set_scope(
+        self, only: Optional[Iterable[tuple]], exclude: Optional[Iterable[tuple]]
+    ) -> None:
+        """
+        Set subtrees to translate. Paths and errors of a previous scope are forgotten.
+
+        """
+        scope = (
+            None if only is None else tuple(tuple(path) for path in only),
+            () if exclude is None else tuple(tuple(path) for path in exclude),
+        )
+
+        if scope != self._scope:
+            self._scope = scope
+            self._paths = None
+            self._nodes = None
+            self._any_error = False
+            self._diagnostics.clear()
+
+    def _in_scope(self, path: tuple) -> bool:
+        """
+        Check whether a path is within subtrees to translate.
+
+        """
+        only, exclude = self._scope
+
+        if any(path[: len(excluded)] == excluded for excluded in exclude):
+            return False
+
+        return (only is None) or any(path[: len(included)] == included for included in only)
+
+    def _prune(self, errors: dict, prefix: tuple = ()) -> dict:
+        """
+        Copy the part of errors of Cerberus which is within subtrees to translate. Subtrees without
+        any path to include or exclude below them are not visited.
+
+        """
+        only, exclude = self._scope
+        pruned = dict()
+
+        for key, value in errors.items():
+            path = prefix + (key,)
+            deeper = any(
+                (len(target) > len(path)) and (target[: len(path)] == path)
+                for target in (only or ()) + exclude
+            )
+
+            if not deeper:
+                if self._in_scope(path):
+                    pruned[key] = value
+                continue
+
+            if any(path[: len(excluded)] == excluded for excluded in exclude):
+                continue
+
+            in_scope = self._in_scope(path)
+            items = [
+                self._prune(item, path) if isinstance(item, dict) else item
+                for item in value
+                if isinstance(item, dict) or in_scope
+            ]
+            items = [item for item in items if item != {}]
+
+            if items != []:
+                pruned[key] = items
+
+        return pruned
+
+    def _match(self, partial: bool = False) -> Iterator[tuple]:
+        """
+        Find predefined messages for errors, path by path. In the partial mode errors without a record
+        are paired with None.
+
+        """
         for path in self.paths:
-            for error in self._validator.document_error_tree.fetch_errors_from(path):
-                no_record = False
-                for record in self.records:
-                    if (error.code in record) and (path in record):
-                        no_record = True
-                        key = sep.join(map(str, path))
+            yield from self._match_errors(path, self._fetch_errors(path), partial)
+
+    def _match_errors(self, path: tuple, errors: Iterable, partial: bool) -> Iterator[tuple]:
+        """
+        Find predefined messages for errors under a path. Cerberus has no message for group errors of
+        nested rules, so in the partial mode those without a valid record are replaced by their child
+        errors, matched under their own paths.
+
+        """
+        pairs, children = list(), dict()
+
+        for error in errors:
+            messages = self._match_records(path, error.code)
+
+            if (messages == ()) and self._expand_groups and self._is_nested_group(error):
+                continue
+
+            if partial and self._is_nested_group(error):
+                valid = tuple(m for m in messages if self._check_message(path, error, m))
+
+                if (messages == ()) or (valid != messages):
+                    if messages == ():
+                        self._report_error(NO_RECORD, path=path, code=error.code)
+
+                    pairs.extend((error, message) for message in valid)
+
+                    if not self._expand_groups:
+                        for child_error in error.child_errors:
+                            children.setdefault(child_error.document_path, []).append(child_error)
+                    continue
 
-                        if key not in errors:
-                            errors.update({key: [self._converter.convert_message(error, record[-1])]})
-                        else:
-                            errors[key].append(self._converter.convert_message(error, record[-1]))
+            if messages == ():
+                self._report_error(NO_RECORD, path=path, code=error.code)
 
-                if not no_record:
-                    self._report_error(
-                        f"File '{self._path_to_file}' does not contain a record "
-                        f"for path {path} and error code {error.code}"
-                    )
+                if partial:
+                    messages = (None,)
 
-        if self._converter.any_error:
-            self._report_error(*self._converter.error_list)
+            pairs.extend((error, message) for message in messages)
 
-        return errors
+        if pairs != []:
+            yield path, pairs
+
+        for child_path, child_errors in children.items():
+            yield from self._match_errors(child_path, child_errors, partial)
+
+    @staticmethod
+    def _nest(errors: dict) -> dict:
+        """
+        Convert pairs (path):(list of messages) into the nested layout of Cerberus's errors.
+
+        """
+        tree = dict()
+
+        for path, messages in errors.items():
+            node = tree
+
+            for field in path[:-1]:
+                entry = node.setdefault(field, [])
+
+                if (entry == []) or (not isinstance(entry[-1], dict)):
+                    entry.append(dict())
+                node = entry[-1]
+
+            entry = node.setdefault(path[-1], [])
+
+            if (entry != []) and isinstance(entry[-1], dict):
+                entry[-1:-1] = messages
+            else:
+                entry.extend(messages)
+
+        return tree
+
+    @staticmethod
+    def _format_message(error: ValidationError) -> str:
+        """
+        Format a message of Cerberus for an error.
+
+        """
+        message = BasicErrorHandler.messages.get(error.code, "{0}")
+
+        try:
+            return message.format(
+                *error.info,
+                constraint=error.constraint,
+                field=error.field,
+                value=error.value,
+            )
+        except (IndexError, KeyError):
+            return message
+
+    def _original_errors(self) -> dict:
+        """
+        Get errors generated by Cerberus, returned if the translation fails.
+
+        """
+        if self._scope != (None, ()):
+            return self._prune(self._validator.errors)
+
+        return self._validator.errors
+
+    def _fetch_errors(self, path: tuple) -> list:
+        """
+        Fetch errors of Cerberus assigned to a path.
+
+        """
+        if self._nodes is not None:
+            return self._nodes[path]
+
+        return self._validator.document_error_tree.fetch_errors_from(path)
+
+    @staticmethod
+    def _is_nested_group(error: ValidationError) -> bool:
+        """
+        Check whether an error only groups errors of nested rules, so Cerberus has no message for it.
+
+        """
+        return error.is_group_error and (not error.is_logic_error)
+
+    def _match_records(self, path: tuple, code: int) -> tuple:
+        """
+        Get predefined messages matching a path and an error code.
 
-    def _report_error(self, *errors: str) -> None:
+        """
+        return self._converter.find_messages(path, code)
+
+    def _convert_message(self, error: ValidationError, message: str) -> str:
+        """
+        Convert a predefined message using attributes of an error.
+
+        """
+        return self._converter.convert_message(error, message)
+
+    def _check_message(self, path: tuple, error: ValidationError, message: str) -> bool:
+        """
+        Check whether a predefined message can be converted, reporting attributes which do not exist.
+
+        """
+        attrs = self._converter.invalid_attributes(error, message)
+
+        for attr in attrs:
+            self._report_error(INVALID_EXPRESSION, path=path, code=error.code, attr=attr)
+
+        return attrs == ()
+
+    def _report_error(self, kind: str, **details) -> None:
         """
         Notify occurred errors.
 
         """
         self._any_error = True
-
-        for error in errors:
-            self._error_list.append(error)
+        self._diagnostics.report(kind, **details)
 
     @property
     def paths(self) -> tuple:
@@ -165,11 +512,24 @@ class Translator:
 
         Returns
         -------
-        dict : A dictionary composed of pairs (path to element):(list of errors) or errors returned by Cerberus.
+        dict : A dictionary composed of pairs (path to element):(list of errors) or errors returned by Cerberus,
+               set by the last call of translate.
 
         """
         return self._errors
 
+    @property
+    def missing(self) -> tuple:
+        """
+        Get errors which got messages of Cerberus during the last partial translation.
+
+        Returns
+        -------
+        tuple : Pairs (path, code) without a record or with a message which cannot be converted.
+
+        """
+        return tuple(self._missing)
+
     @property
     def any_error(self) -> bool:
         """
@@ -180,7 +540,7 @@ class Translator:
         bool : False if no errors, otherwise True.
 
         """
-        return self._any_error
+        return self._any_error or self._converter.any_error
 
     @property
     def error_list(self) -> list:
@@ -192,7 +552,19 @@ class Translator:
         list : List of messages.
 
         """
-        return self._error_list
+        return self._converter.error_list + self._diagnostics.messages
+
+    @property
+    def diagnostics(self) -> Diagnostics:
+        """
+        Get structured errors which occurred during translating, excluding those of reading the file.
+
+        Returns
+        -------
+        Diagnostics : Bounded container of errors.
+
+        """
+        return self._diagnostics
 
     @property
     def validator(self) -> Validator:
@@ -212,7 +584,9 @@ class Translator:
         Setter for validator.
 
         """
-        self.__init__(new_validator, self._path_to_file)
+        self.__init__(
+            new_validator, self._path_to_file, self._formats, self._converter, self._expand_groups
+        )
 
     @property
     def path_to_file(self) -> Path:
@@ -232,4 +606,6 @@ class Translator:
         Setter for path_to_file.
 
         """
-        self.__init__(self._validator, new_path_to_file)
+        self.__init__(
+            self._validator, new_path_to_file, self._formats, expand_groups=self._expand_groups
+        )
@@ -0,0 +1,41 @@
+"""
+Fixtures shared by unit tests.
+
+"""
+import pytest
+
+from cerberror.profiler import Profiler
+
+ALLOCATION_LIMIT = 128 * 1024
+ENCODING = "utf-8"
+
+
+@pytest.fixture
+def allocation_limit():
+    """Return a function failing a test if a document allocates more memory than a limit."""
+
+    def check(schema, path_to_file, documents, limit=ALLOCATION_LIMIT):
+        profiler = Profiler(schema, path_to_file, track_allocations=True).run(documents)
+
+        if profiler.peak_per_document > limit:
+            pytest.fail(
+                f"Peak of {profiler.peak_per_document} bytes per document exceeds {limit} bytes\n"
+                + profiler.report()
+            )
+
+        return profiler
+
+    yield check
+
+
+@pytest.fixture
+def write_catalog(tmp_path):
+    """Return a function writing records to a catalog of messages in a temporary directory."""
+
+    def write(content, name="msgs.txt"):
+        path = tmp_path / name
+        path.write_text(content, encoding=ENCODING)
+
+        return path
+
+    yield write
@@ -0,0 +1,268 @@
+"""
+Unit tests for cerberror.catalog module.
+
+"""
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+from cerberus import Validator
+
+from cerberror.__main__ import main
+from cerberror.catalog import (
+    build_index,
+    clear_preloaded,
+    index_defaults,
+    index_path,
+    index_records,
+    parse_line,
+    preload,
+    preloaded,
+    prefix_key,
+    read_index,
+    read_shard,
+)
+from cerberror.errors import ErrConverter
+from cerberror.trans import Translator
+from tests.test_handler import document, schema
+
+
+@pytest.fixture
+def catalog(write_catalog):
+    yield write_catalog(
+        "# comment\n"
+        "('a',) 147 \"None of definitions\"\n"
+        "('p', 'x') 36 \"x must be an integer\"\n"
+        "('a',) 66 \"{{value}} < {{constraint}}\"\n"
+        "('a',) 36 \"Not a {{constraint}}\"\n"
+        "(1, 'x') 36 \"Integer key\"\n"
+        "('q',) 3 \"Unknown field ł\"\n"
+    )
+
+
+@pytest.fixture(autouse=True)
+def no_preloaded():
+    clear_preloaded()
+    yield
+    clear_preloaded()
+
+
+@pytest.mark.parametrize(
+    "line, result",
+    [
+        ("('a', 'b') 36 \"Message\"\n", (("a", "b"), 36, "Message")),
+        ('  (1,)   2 "{{field}}"', ((1,), 2, "{{field}}")),
+        ("# ('a',) 2 \"Message\"", None),
+        ("", None),
+    ],
+)
+def test_parse_line(line, result):
+    assert parse_line(line) == result
+
+
+def test_prefix_key():
+    assert prefix_key(("a", 1)) == "'a'"
+    assert prefix_key((1, "a")) == "1"
+    assert prefix_key(()) == "()"
+
+
+def test_build_index(catalog):
+    path = build_index(catalog)
+    shards = json.loads(path.read_text(encoding="utf-8"))["shards"]
+
+    assert path == index_path(catalog) == catalog.with_name("msgs.txt.idx")
+    assert list(shards) == ["'a'", "'p'", "1", "'q'"]
+    assert len(shards["'a'"]) == 2
+    assert read_index(catalog) == shards
+    assert read_shard(catalog, shards["'a'"]) == [
+        (("a",), 147, "None of definitions"),
+        (("a",), 66, "{{value}} < {{constraint}}"),
+        (("a",), 36, "Not a {{constraint}}"),
+    ]
+    assert read_shard(catalog, shards["'q'"]) == [(("q",), 3, "Unknown field ł")]
+
+
+def test_read_index_missing_or_stale(catalog):
+    assert read_index(catalog) is None
+
+    build_index(catalog)
+    catalog.write_text("('a',) 2 \"Required\"\n", encoding="utf-8")
+    os.utime(catalog, ns=(0, 0))
+
+    assert read_index(catalog) is None
+
+
+def test_converter_lazy(catalog):
+    build_index(catalog)
+    converter = ErrConverter(catalog)
+
+    assert converter.loaded_shards == ()
+    assert converter.find_messages(("a",), 66) == ("{{value}} < {{constraint}}",)
+    assert converter.find_messages(("b",), 66) == ()
+    assert sorted(converter.loaded_shards) == ["'a'", "'b'"]
+    assert converter.find_messages((1, "x"), 36) == ("Integer key",)
+    assert not converter.any_error
+
+
+def test_converter_lazy_records(catalog):
+    records = ErrConverter(catalog).user_defined_records
+    build_index(catalog)
+    converter = ErrConverter(catalog)
+
+    assert converter.user_defined_records == records
+    assert sorted(converter.loaded_shards) == ["'a'", "'p'", "'q'", "1"]
+    assert converter.find_messages(("p", "x"), 36) == ("x must be an integer",)
+
+
+def test_converter_lazy_no_messages(write_catalog):
+    path = write_catalog("# no records\n")
+    build_index(path)
+    converter = ErrConverter(path)
+
+    assert converter.any_error
+    assert converter.error_list == [f"No customized messages have been found in '{path}' file"]
+
+
+def test_translator_lazy_same_result(catalog):
+    validator = Validator(schema)
+    validator.validate(document)
+    result = Translator(validator, catalog).translate()
+    build_index(catalog)
+    translator = Translator(validator, catalog)
+
+    assert translator.translate() == result
+    assert "'l'" in translator._converter.loaded_shards
+
+
+def test_main_index(catalog, capsys):
+    assert main(["index", str(catalog)]) == 0
+    assert capsys.readouterr().out.strip() == str(index_path(catalog))
+    assert read_index(catalog) is not None
+
+
+def test_preload(catalog):
+    catalogs = preload([catalog])
+    loaded = catalogs[catalog.resolve()]
+
+    assert preloaded(catalog) is loaded
+    assert loaded.records == ErrConverter(catalog).user_defined_records
+    assert loaded.index[(("a",), 66)] == ("{{value}} < {{constraint}}",)
+    assert loaded.templates["{{value}} < {{constraint}}"] == ("value", "constraint")
+
+
+def test_converter_uses_preloaded(catalog):
+    loaded = preload([str(catalog)])[catalog.resolve()]
+
+    with patch("builtins.open", side_effect=AssertionError("file read")):
+        converter = ErrConverter(catalog)
+
+    assert converter.user_defined_records is loaded.records
+    assert converter.find_messages(("p", "x"), 36) == ("x must be an integer",)
+    assert not converter.any_error
+
+
+def test_preloaded_stale(catalog):
+    preload([catalog])
+    catalog.write_text("('a',) 2 \"Required\"\n", encoding="utf-8")
+    os.utime(catalog, ns=(0, 0))
+
+    assert preloaded(catalog) is None
+    assert ErrConverter(catalog).user_defined_records == ((("a",), 2, "Required"),)
+
+
+def test_preload_missing_file(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        preload([tmp_path / "none.txt"])
+
+    assert preloaded(tmp_path / "none.txt") is None
+
+
+def test_preload_freeze(catalog):
+    with patch("cerberror.catalog.gc") as gc_mock:
+        preload([catalog], freeze=True)
+
+    gc_mock.collect.assert_called_once()
+    gc_mock.freeze.assert_called_once()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork() is not available")
+def test_preload_fork(catalog):
+    preload([catalog])
+    read, write = os.pipe()
+    pid = os.fork()
+
+    if pid == 0:
+        with patch("builtins.open", side_effect=AssertionError("file read")):
+            messages = ErrConverter(catalog).find_messages(("a",), 36)
+
+        os.write(write, json.dumps(messages).encode())
+        os._exit(0)
+
+    os.close(write)
+    os.waitpid(pid, 0)
+
+    assert json.loads(os.read(read, 1024)) == ["Not a {{constraint}}"]
+
+
+def test_index_records():
+    index = index_records([(("a",), 36, "First"), (("b",), 2, "Other"), (("a",), 36, "Second")])
+
+    assert index == {(("a",), 36): ("First", "Second"), (("b",), 2): ("Other",)}
+    assert index_records([(("c",), 2, "Third")], index) is index
+    assert index[(("c",), 2)] == ("Third",)
+
+
+def test_index_defaults():
+    defaults, depths = dict(), dict()
+    index_defaults(
+        [
+            ((...,), 36, "Any"),
+            (("a", ...), 36, "Under a"),
+            (("a", ...), 36, "Under a, again"),
+            (("a", "b"), 36, "Exact"),
+            (("a", "b", ...), 2, "Under a, b"),
+        ],
+        defaults,
+        depths,
+    )
+
+    assert defaults == {
+        ((), 36): ("Any",),
+        (("a",), 36): ("Under a", "Under a, again"),
+        (("a", "b"), 2): ("Under a, b",),
+    }
+    assert depths == {36: (1, 0), 2: (2,)}
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_converter_defaults_lazy_and_preloaded(write_catalog, lazy):
+    path = write_catalog(
+        "('a',) 36 \"Exact\"\n" '(...,) 36 "Any {{constraint}}"\n' "('b', ...) 36 \"Under b\"\n"
+    )
+
+    if lazy:
+        build_index(path)
+    else:
+        preload([path])
+
+    converter = ErrConverter(path)
+
+    assert converter.find_messages(("c", 1), 36) == ("Any {{constraint}}",)
+    assert converter.find_messages(("b", 1), 36) == ("Under b",)
+    assert converter.find_messages(("a",), 36) == ("Exact",)
+
+
+def test_translator_defaults(write_catalog):
+    path = write_catalog(
+        '(...,) 36 "{{field}} must be {{constraint}}"\n' "('p', ...) 36 \"Bad p\"\n"
+    )
+    validator = Validator(
+        {"a": {"type": "integer"}, "p": {"type": "dict", "schema": {"x": {"type": "string"}}}}
+    )
+    validator.validate({"a": "s", "p": {"x": 1}})
+
+    assert Translator(validator, path).translate() == {
+        "a": ["a must be integer"],
+        "p -> x": ["Bad p"],
+    }
@@ -0,0 +1,81 @@
+"""
+Unit tests for cerberror.diagnostics module.
+
+"""
+import pytest
+
+from cerberror.diagnostics import (
+    INVALID_EXPRESSION,
+    NO_FILE,
+    NO_MESSAGES,
+    NO_PATH,
+    NO_RECORD,
+    Diagnostics,
+)
+from tests.test_errors import path_to_file
+
+
+@pytest.mark.parametrize(
+    "kind, details, message",
+    [
+        (NO_FILE, {}, f"File '{path_to_file}' does not exist"),
+        (NO_MESSAGES, {}, f"No customized messages have been found in '{path_to_file}' file"),
+        (
+            INVALID_EXPRESSION,
+            {"attr": "foo"},
+            f"Invalid expression '{{{{foo}}}}' in file '{path_to_file}'",
+        ),
+        (
+            NO_RECORD,
+            {"path": ("a", 1), "code": 36},
+            f"File '{path_to_file}' does not contain a record for path ('a', 1) and error code 36",
+        ),
+        (NO_PATH, {}, "No path was found"),
+    ],
+)
+def test_messages(kind, details, message):
+    diagnostics = Diagnostics(path_to_file)
+    diagnostics.report(kind, **details)
+
+    assert diagnostics.messages == [message]
+
+
+def test_report_counts():
+    diagnostics = Diagnostics(path_to_file)
+
+    for _ in range(1000):
+        diagnostics.report(INVALID_EXPRESSION, attr="foo")
+        diagnostics.report(NO_RECORD, path=("a",), code=2)
+    diagnostics.report(NO_RECORD, path=("a",), code=3)
+
+    assert len(diagnostics) == 3
+    assert diagnostics.counts == {
+        (INVALID_EXPRESSION, None, None, "foo"): 1000,
+        (NO_RECORD, ("a",), 2, None): 1000,
+        (NO_RECORD, ("a",), 3, None): 1,
+    }
+    assert list(diagnostics) == list(diagnostics.counts)
+
+
+def test_report_max_size():
+    diagnostics = Diagnostics(path_to_file, max_size=2)
+
+    for code in range(5):
+        diagnostics.report(NO_RECORD, path=("a",), code=code)
+    diagnostics.report(NO_RECORD, path=("a",), code=0)
+
+    assert len(diagnostics) == 2
+    assert diagnostics.dropped == 3
+    assert diagnostics.counts[(NO_RECORD, ("a",), 0, None)] == 2
+    assert diagnostics.messages[-1] == "3 more errors have been dropped"
+
+
+def test_clear():
+    diagnostics = Diagnostics(path_to_file, max_size=1)
+    diagnostics.report(NO_PATH)
+    diagnostics.report(NO_FILE)
+    diagnostics.clear()
+
+    assert len(diagnostics) == 0
+    assert diagnostics.dropped == 0
+    assert diagnostics.messages == []
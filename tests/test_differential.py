@@ -0,0 +1,586 @@
+"""
+Differential tests comparing optimised translation with reference implementations.
+
+Examples (a schema, a document and a catalog) are generated from seeds. If an example breaks a property,
+it is shrunk to a smaller one which still breaks it. Set CERBERROR_DIFF_SEED and CERBERROR_DIFF_EXAMPLES
+environment variables to explore other examples.
+
+"""
+import itertools
+import json
+import os
+import pickle
+import random
+import re
+from io import BytesIO
+
+import pytest
+from cerberus import Validator
+from cerberus.errors import BasicErrorHandler
+from cerberus.schema import SchemaError
+
+from cerberror.catalog import build_index, clear_preloaded, preload
+from cerberror.diagnostics import (
+    INVALID_EXPRESSION,
+    NO_MESSAGES,
+    NO_PATH,
+    NO_RECORD,
+    TEMPLATES,
+)
+from cerberror.paths import PathFinder, walk_error_tree
+from cerberror.records import RecordTranslator, dump_errors
+from cerberror.trans import TUPLE, Translator
+
+SEED = int(os.environ.get("CERBERROR_DIFF_SEED", 0))
+EXAMPLES = int(os.environ.get("CERBERROR_DIFF_EXAMPLES", 40))
+MAX_SHRINKS = 300
+
+FIELDS = ("a", "b", "c", "d")
+JUNK = (1, 7, -1, 2.5, "x", "abc", "zzzz", None, [], {}, [1, "x"], {"a": 1})
+MESSAGES = (
+    "Error {{value}}",
+    "{{field}} vs {{constraint}}",
+    "Rule {{rule}}",
+    "Plain message",
+    "{{value}} and {{value}}",
+)
+INVALID_MESSAGE = "Bad {{foo}}"
+
+files = itertools.count()
+
+
+# ==================== GENERATORS ====================
+
+
+def gen_rules(rnd, depth):
+    kinds = ["integer", "string", "allowed"]
+
+    if depth < 2:
+        kinds += ["dict", "list", "anyof", "oneof"]
+
+    kind = rnd.choice(kinds)
+
+    if kind == "integer":
+        rules = {"type": "integer"}
+        if rnd.random() < 0.5:
+            rules["min"] = rnd.randint(0, 5)
+        if rnd.random() < 0.3:
+            rules["max"] = rnd.randint(5, 9)
+    elif kind == "string":
+        rules = {"type": "string"}
+        if rnd.random() < 0.4:
+            rules["minlength"] = 2
+        if rnd.random() < 0.3:
+            rules["regex"] = "^[a-c]+$"
+    elif kind == "allowed":
+        rules = {"allowed": [1, 2, 3]}
+    elif kind == "dict":
+        rules = {"type": "dict", "schema": gen_schema(rnd, depth + 1)}
+        if rnd.random() < 0.2:
+            rules["minlength"] = 3
+    elif kind == "list":
+        rules = {"type": "list", "schema": gen_rules(rnd, depth + 1)}
+        if rnd.random() < 0.2:
+            rules["maxlength"] = 2
+    else:
+        rules = {kind: [gen_rules(rnd, 2), gen_rules(rnd, 2)]}
+
+    if rnd.random() < 0.2:
+        rules["required"] = True
+
+    return rules
+
+
+def gen_schema(rnd, depth=0):
+    return {field: gen_rules(rnd, depth) for field in rnd.sample(FIELDS, rnd.randint(1, 3))}
+
+
+def gen_value(rnd, rules):
+    if rnd.random() < 0.25:
+        return rnd.choice(JUNK)
+
+    if rules.get("type") == "dict":
+        return gen_document(rnd, rules["schema"])
+
+    if rules.get("type") == "list":
+        return [gen_value(rnd, rules["schema"]) for _ in range(rnd.randint(0, 3))]
+
+    if rules.get("type") == "string":
+        return rnd.choice(["a", "abc", "cab", "xyz", 3])
+
+    return rnd.choice([0, 1, 2, 4, 6, 10, "s"])
+
+
+def gen_document(rnd, schema):
+    document = {
+        field: gen_value(rnd, rules) for field, rules in schema.items() if rnd.random() < 0.8
+    }
+
+    if rnd.random() < 0.1:
+        document["z"] = 1
+
+    return document
+
+
+def error_pairs(validator):
+    """Get (path, code) pairs of errors seen by the reference and by the error tree."""
+    pairs = list()
+
+    if validator.errors:
+        for path in PathFinder(validator.errors).paths:
+            pairs.extend(
+                (path, error.code)
+                for error in validator.document_error_tree.fetch_errors_from(path)
+            )
+
+    for path, errors in walk_error_tree(validator.document_error_tree):
+        pairs.extend((path, error.code) for error in errors)
+
+    return list(dict.fromkeys(pairs))
+
+
+def gen_records(rnd, validator):
+    records = list()
+
+    for path, code in error_pairs(validator):
+        if rnd.random() < 0.85:
+            for _ in range(rnd.choice([1, 1, 1, 2])):
+                message = INVALID_MESSAGE if rnd.random() < 0.03 else rnd.choice(MESSAGES)
+                records.append((path, code, message))
+
+    for _ in range(rnd.randint(0, 2)):
+        records.append(((rnd.choice(FIELDS), rnd.randint(0, 2)), rnd.choice([2, 36, 66]), "Unused"))
+
+    rnd.shuffle(records)
+
+    return records
+
+
+def gen_example(seed):
+    rnd = random.Random(seed)
+    schema = gen_schema(rnd)
+    document = gen_document(rnd, schema)
+    validator = Validator(schema)
+    validator.validate(document)
+    records = gen_records(rnd, validator)
+    paths = [path for path, _ in error_pairs(validator)]
+    prefixes = [path[: rnd.randint(1, len(path))] for path in paths]
+    only = rnd.sample(prefixes, min(len(prefixes), rnd.randint(1, 2))) if prefixes else []
+    exclude = rnd.sample(prefixes, 1) if prefixes and rnd.random() < 0.5 else []
+    defaults = [
+        (
+            (rnd.choice(FIELDS), ...) if rnd.random() < 0.5 else (...,),
+            rnd.choice([2, 36, 66, 68]),
+            rnd.choice(MESSAGES),
+        )
+        for _ in range(rnd.randint(0, 3))
+    ]
+
+    return {
+        "schema": schema,
+        "document": document,
+        "records": records,
+        "only": only,
+        "exclude": exclude,
+        "defaults": defaults,
+    }
+
+
+# ==================== REFERENCE ====================
+
+
+def write_catalog(directory, records):
+    path = directory / f"catalog_{next(files)}.txt"
+    lines = [
+        f'{path_!r} {code} "{message}"\n'.replace("Ellipsis", "...")
+        for path_, code, message in records
+    ]
+    path.write_text("".join(lines), encoding="utf-8")
+
+    return path
+
+
+def validate(example):
+    validator = Validator(example["schema"])
+    validator.validate(example["document"])
+
+    return validator
+
+
+def reference_convert(error, message, path, diagnostics):
+    """Convert a message as the first version of ErrConverter.convert_message did."""
+    any_error = False
+
+    for attr in [i.strip("{}") for i in re.findall(r"{{[^{}]+}}", message)]:
+        if hasattr(error, attr):
+            message = message.replace("{{" + attr + "}}", str(getattr(error, attr)))
+        else:
+            any_error = True
+            diagnostics.append((INVALID_EXPRESSION, path, error.code, attr))
+
+    return message if not any_error else None
+
+
+def flatten(errors, path=()):
+    """Get pairs (path, message) of errors in the layout of Cerberus."""
+    pairs = list()
+
+    for key, items in errors.items():
+        for item in items:
+            if isinstance(item, dict):
+                pairs.extend(flatten(item, path + (key,)))
+            else:
+                pairs.append((path + (key,), item))
+
+    return pairs
+
+
+def cerberus_message(error, shown):
+    """Get the message Cerberus shows for an error under its path, skipping definitions of logic rules."""
+    node = BasicErrorHandler()([error])
+
+    for field in error.document_path[:-1]:
+        node = node[field][-1]
+
+    (message,) = [item for item in node[error.document_path[-1]] if isinstance(item, str)]
+    assert message in shown, message
+
+    return message
+
+
+def reference_translate(validator, records, sep=" -> ", partial=False):
+    """Translate errors with PathFinder and a linear scan of records, as the first version did.
+
+    In the partial mode errors without a record get messages Cerberus shows for them. Cerberus shows child
+    errors in place of group errors of nested rules, so those are translated under their own paths.
+    """
+    diagnostics, missing = list(), dict()
+
+    if records == []:
+        return validator.errors, [(NO_MESSAGES, None, None, None)], ()
+
+    shown = {message for _, message in flatten(validator.errors)}
+    paths = PathFinder(validator.errors).paths if validator.errors else ()
+
+    if paths == ():
+        diagnostics.append((NO_PATH, None, None, None))
+
+    errors, failed = dict(), paths == ()
+
+    def translate(path, path_errors):
+        nonlocal failed
+        children, invalid = dict(), list()
+
+        for error in path_errors:
+            messages = [r[-1] for r in records if (error.code in r) and (path in r)]
+            nested = partial and error.is_group_error and not error.is_logic_error
+            texts = [
+                reference_convert(error, message, path, diagnostics if nested else invalid)
+                for message in messages
+            ]
+
+            if messages == []:
+                diagnostics.append((NO_RECORD, path, error.code, None))
+
+            if (messages == []) or (None in texts):
+                failed = True
+
+                if nested:
+                    texts = [text for text in texts if text is not None]
+
+                    for child in error.child_errors:
+                        children.setdefault(child.document_path, []).append(child)
+
+                elif partial:
+                    missing[(path, error.code)] = None
+                    fallback = cerberus_message(error, shown)
+                    texts = [fallback if text is None else text for text in texts] or [fallback]
+
+            if texts != []:
+                errors.setdefault(sep.join(map(str, path)), []).extend(texts)
+
+        diagnostics.extend(invalid)
+
+        for child_path, child_errors in children.items():
+            translate(child_path, child_errors)
+
+    for path in paths:
+        translate(path, validator.document_error_tree.fetch_errors_from(path))
+
+    if failed and not partial:
+        errors = validator.errors
+
+    return errors, list(dict.fromkeys(diagnostics)), tuple(missing)
+
+
+def format_diagnostics(path_to_file, diagnostics):
+    return [
+        TEMPLATES[kind].format(file=path_to_file, path=path, code=code, attr=attr)
+        for kind, path, code, attr in diagnostics
+    ]
+
+
+def resolve_default(records, path, code):
+    """Find messages for a path with a brute-force scan of exact records and defaults."""
+    exact = [message for path_, code_, message in records if (path_, code_) == (path, code)]
+
+    if exact != []:
+        return exact
+
+    matching = [
+        (len(path_) - 1, message)
+        for path_, code_, message in records
+        if (code_ == code)
+        and (path_[-1] is Ellipsis)
+        and (path[: len(path_) - 1] == path_[:-1])
+        and (len(path_) - 1 <= len(path))
+    ]
+
+    if matching == []:
+        return []
+
+    depth = max(depth for depth, _ in matching)
+
+    return [message for depth_, message in matching if depth_ == depth]
+
+
+# ==================== HARNESS ====================
+
+
+def failure(check, example, directory):
+    """Run a check and describe how it fails. None if it passes or the example is not valid."""
+    try:
+        check(example, directory)
+    except SchemaError:
+        return None
+    except AssertionError as error:
+        return f"AssertionError: {error}"
+    except Exception as error:
+        return f"{type(error).__name__}: {error}"
+    finally:
+        clear_preloaded()
+
+    return None
+
+
+def without_item(container):
+    """Yield copies of a dictionary or a list with one item removed, also in nested containers."""
+    items = list(container.items()) if isinstance(container, dict) else list(enumerate(container))
+
+    for i, (key, value) in enumerate(items):
+        if isinstance(container, dict):
+            yield {k: v for k, v in items if k != key}
+        else:
+            yield [v for j, (_, v) in enumerate(items) if j != i]
+
+        if isinstance(value, (dict, list)):
+            for smaller in without_item(value):
+                copy = dict(container) if isinstance(container, dict) else list(container)
+                copy[key] = smaller
+                yield copy
+
+
+def shrink_candidates(example):
+    for key in ("records", "defaults", "only", "exclude"):
+        for i in range(len(example[key])):
+            yield dict(example, **{key: example[key][:i] + example[key][i + 1 :]})
+
+    for document in without_item(example["document"]):
+        yield dict(example, document=document)
+
+    for field in example["schema"]:
+        schema = {k: v for k, v in example["schema"].items() if k != field}
+        document = {k: v for k, v in example["document"].items() if k != field}
+        yield dict(example, schema=schema, document=document)
+
+
+def shrink(check, example, directory):
+    """Greedily remove parts of an example as long as the check still fails."""
+    for _ in range(MAX_SHRINKS):
+        for candidate in shrink_candidates(example):
+            if failure(check, candidate, directory) is not None:
+                example = candidate
+                break
+        else:
+            break
+
+    return example
+
+
+def differential(check, directory):
+    for seed in range(SEED, SEED + EXAMPLES):
+        example = gen_example(seed)
+
+        if failure(check, example, directory) is not None:
+            example = shrink(check, example, directory)
+            pytest.fail(
+                f"Seed {seed} breaks {check.__name__}, shrunk example:\n{example!r}\n"
+                + failure(check, example, directory)
+            )
+
+
+# ==================== PROPERTIES ====================
+
+
+def check_translate(example, directory):
+    validator = validate(example)
+    path = write_catalog(directory, example["records"])
+    errors, diagnostics, _ = reference_translate(validator, example["records"])
+    expected_errors = format_diagnostics(path, diagnostics)
+
+    translator = Translator(validator, path)
+    assert translator.translate() == errors
+    assert translator.error_list == expected_errors
+
+    build_index(path)
+    translator = Translator(validator, path)
+    assert translator.translate() == errors, "indexed catalog"
+    assert translator.error_list == expected_errors, "indexed catalog"
+
+    preload([path])
+    translator = Translator(validator, path)
+    assert translator.translate() == errors, "preloaded catalog"
+    assert translator.error_list == expected_errors, "preloaded catalog"
+
+
+def check_partial(example, directory):
+    validator = validate(example)
+    records = example["records"] or [(("none",), 0, "None")]
+    path = write_catalog(directory, records)
+    errors, _, missing = reference_translate(validator, records, partial=True)
+    translator = Translator(validator, path)
+
+    assert translator.translate(partial=True) == (errors if validator.errors else {})
+    assert translator.missing == missing
+
+
+def check_paths(example, directory):
+    validator = validate(example)
+    tree = validator.document_error_tree
+    nodes = dict(walk_error_tree(tree))
+    paths = PathFinder(validator.errors).paths if validator.errors else ()
+
+    for path in paths:
+        assert path in nodes, path
+        assert list(nodes[path]) == list(tree.fetch_errors_from(path)), path
+
+
+def check_records(example, directory):
+    validator = validate(example)
+    path = write_catalog(directory, example["records"])
+    translator = Translator(validator, path)
+    errors = translator.translate()
+    records = json.loads(json.dumps(dump_errors(validator), default=str))
+    record_translator = RecordTranslator(records, path)
+    record_errors = record_translator.translate()
+
+    assert record_translator.any_error == translator.any_error
+
+    if not translator.any_error:
+        assert record_errors == errors
+    else:
+        # JSON turns tuples of attributes into lists, so messages of Cerberus are compared after pickle.
+        records = pickle.loads(pickle.dumps(dump_errors(validator)))
+        record_translator = RecordTranslator(records, path)
+
+        assert record_translator.translate(partial=True) == translator.translate(partial=True)
+        assert record_translator.missing == translator.missing
+
+
+def check_write_json(example, directory):
+    validator = validate(example)
+    path = write_catalog(directory, example["records"])
+    file = BytesIO()
+    Translator(validator, path).write_json(file)
+    errors = Translator(validator, path).translate()
+
+    assert json.loads(file.getvalue()) == json.loads(json.dumps(errors, default=str))
+
+
+def check_defaults(example, directory):
+    validator = validate(example)
+    records = example["records"] + example["defaults"]
+    path = write_catalog(directory, records)
+    expanded = [
+        (path_, code, message)
+        for path_, code in error_pairs(validator)
+        for message in resolve_default(records, path_, code)
+    ]
+    errors, _, _ = reference_translate(validator, expanded)
+
+    assert Translator(validator, path).translate() == errors
+
+
+def check_scope(example, directory):
+    validator = validate(example)
+    path = write_catalog(directory, example["records"])
+    only, exclude = example["only"] or None, example["exclude"]
+
+    def in_scope(key):
+        if any(key[: len(excluded)] == excluded for excluded in exclude):
+            return False
+        return (only is None) or any(key[: len(included)] == included for included in only)
+
+    for expand_groups in (False, True):
+        translator = Translator(validator, path, expand_groups=expand_groups)
+        errors = translator.translate(shape=TUPLE)
+        partial = translator.any_error
+
+        if partial:
+            errors = translator.translate(shape=TUPLE, partial=True)
+
+        scoped = Translator(validator, path, expand_groups=expand_groups)
+        scoped_errors = scoped.translate(shape=TUPLE, partial=partial, only=only, exclude=exclude)
+
+        if scoped.any_error and not partial:
+            continue
+
+        # Paths are found in the pruned tree, so a child of a node with its own errors may be translated
+        # under its own path instead of the path of the node.
+        assert all(in_scope(key) for key in scoped_errors), (expand_groups, partial)
+        assert all(
+            scoped_errors.get(key) == messages for key, messages in errors.items() if in_scope(key)
+        ), (expand_groups, partial)
+
+
+@pytest.mark.parametrize(
+    "check",
+    [
+        check_translate,
+        check_partial,
+        check_paths,
+        check_records,
+        check_write_json,
+        check_defaults,
+        check_scope,
+    ],
+)
+def test_differential(check, tmp_path):
+    differential(check, tmp_path)
+
+
+def test_shrink(tmp_path):
+    def check_no_b(example, directory):
+        assert "b" not in example["document"]
+
+    example = {
+        "schema": {"a": {"type": "integer"}, "b": {"type": "dict"}},
+        "document": {"a": 1, "b": {"c": [1, 2]}},
+        "records": [(("a",), 36, "Message")],
+        "only": [],
+        "exclude": [],
+        "defaults": [],
+    }
+
+    assert shrink(check_no_b, example, tmp_path) == {
+        "schema": {"b": {"type": "dict"}},
+        "document": {"b": {}},
+        "records": [],
+        "only": [],
+        "exclude": [],
+        "defaults": [],
+    }
+
+
+def test_gen_example_is_deterministic():
+    assert repr(gen_example(SEED)) == repr(gen_example(SEED))
@@ -7,7 +7,9 @@ from unittest.mock import patch
 
 import pytest
 
-from cerberror.errors import ErrConverter
+from cerberror.catalog import index_records
+from cerberror.diagnostics import NO_FILE, NO_MESSAGES, Diagnostics
+from cerberror.errors import AttributeFormat, ErrConverter, OverlayConverter, find_attributes
 
 path_to_file = "path/to/file"
 
@@ -15,6 +17,9 @@ path_to_file = "path/to/file"
 class ValidationError:
     """Class emulating ValidationError of Cerberus."""
 
+    is_group_error = False
+    is_logic_error = False
+
     def __init__(self, attr_dct) -> None:
         for attr in attr_dct:
             setattr(self, attr, attr_dct[attr])
@@ -33,6 +38,12 @@ def converter_init_mock():
         converter = ErrConverter(path_to_file)
         converter._path_to_file = path_to_file
         converter._any_error = False
+        converter._formats = dict()
+        converter._constraints = dict()
+        converter._shards = None
+        converter._templates = dict()
+        converter._defaults = dict()
+        converter._depths = dict()
         yield converter
 
 
@@ -75,18 +86,14 @@ def test_read_predefined_messages_no_messages_found(converter_report_error_mock,
     open_mock.return_value = stream
     converter_report_error_mock._read_predefined_messages()
 
-    converter_report_error_mock._report_error.assert_called_once_with(
-        f"No customized messages have been found in '{path_to_file}' file"
-    )
+    converter_report_error_mock._report_error.assert_called_once_with(NO_MESSAGES)
 
 
 def test_read_predefined_messages_file_not_found_error(converter_report_error_mock, open_mock):
     open_mock.side_effect = FileNotFoundError
     converter_report_error_mock._read_predefined_messages()
 
-    converter_report_error_mock._report_error.assert_called_once_with(
-        f"File '{path_to_file}' does not exist"
-    )
+    converter_report_error_mock._report_error.assert_called_once_with(NO_FILE)
 
 
 @pytest.mark.parametrize(
@@ -115,17 +122,221 @@ def test_convert_message(converter_init_mock, error, predefined_msg, converted_m
 
 
 @pytest.mark.parametrize(
-    "error, predefined_msg, call_counter",
+    "error, predefined_msg, attrs",
     [
         (
             ValidationError({"field": "mass", "constraint": [100, 150, 200]}),
             "The {{ field}} should be set on {{constraint}} only",
-            1,
+            (" field",),
+        ),
+        (
+            ValidationError({"month": "February", "max": 29}),
+            "{{nonth}} has max {{ max }} days",
+            ("nonth", " max "),
         ),
-        (ValidationError({"month": "February", "max": 29}), "{{nonth}} has max {{ max }} days", 2),
     ],
 )
-def test_convert_message_no_attr(converter_report_error_mock, error, predefined_msg, call_counter):
-    converter_report_error_mock.convert_message(error, predefined_msg)
+def test_convert_message_no_attr(converter_report_error_mock, error, predefined_msg, attrs):
+    assert converter_report_error_mock.convert_message(error, predefined_msg) is None
+    assert not converter_report_error_mock.check_message(error, predefined_msg)
+    assert converter_report_error_mock.invalid_attributes(error, predefined_msg) == attrs
+    converter_report_error_mock._report_error.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "message, result",
+    [
+        ("The {{field}} should be set on {{constraint}} only", ("field", "constraint")),
+        ("{{nonth}} has max {{ max }} days", ("nonth", " max ")),
+        ("Example error message", ()),
+    ],
+)
+def test_find_attributes(message, result):
+    assert find_attributes(message) == result
+
+
+def test_find_messages(converter_init_mock):
+    converter_init_mock._index = index_records(
+        (
+            (("a", "b"), 36, "First message"),
+            (("a",), 36, "Second message"),
+            (("a", "b"), 36, "Third message"),
+            (("a", "b"), 68, "Fourth message"),
+        )
+    )
+
+    assert converter_init_mock.find_messages(("a", "b"), 36) == ("First message", "Third message")
+    assert converter_init_mock.find_messages(("a",), 36) == ("Second message",)
+    assert converter_init_mock.find_messages(("a",), 68) == ()
+
+
+@pytest.mark.parametrize(
+    "attr_format, value, result",
+    [
+        (AttributeFormat(), [1, 2, 3], "[1, 2, 3]"),
+        (AttributeFormat(max_length=8), list(range(10000)), "[0, 1..."),
+        (AttributeFormat(max_length=9), (1, 2, 3), "(1, 2, 3)"),
+        (AttributeFormat(max_length=5, ellipsis="~"), "abcdefgh", "abcd~"),
+        (AttributeFormat(max_length=2), "abc", ".."),
+        (AttributeFormat(max_length=0), "abc", ""),
+        (AttributeFormat(use_repr=True), "abc", "'abc'"),
+        (AttributeFormat(max_length=6, use_repr=True), "abcdefgh", "'ab..."),
+        (AttributeFormat(max_length=4), 123456, "1..."),
+    ],
+)
+def test_attribute_format(attr_format, value, result):
+    assert attr_format.format(value) == result
+
+
+def test_convert_message_formats(converter_init_mock):
+    converter_init_mock._formats = {"constraint": AttributeFormat(max_length=10)}
+    error = ValidationError({"value": "x" * 20, "constraint": list(range(100))})
+
+    assert converter_init_mock.convert_message(error, "{{value}} not in {{constraint}}") == (
+        "x" * 20 + " not in [0, 1, ..."
+    )
+
+
+def test_format_attribute_constraint_cache(converter_init_mock):
+    constraint = [1, 2, 3]
+    error = ValidationError({"constraint": constraint, "value": 5})
+
+    assert converter_init_mock.format_attribute(error, "constraint") == "[1, 2, 3]"
+    constraint.append(4)
+    assert converter_init_mock.format_attribute(error, "constraint") == "[1, 2, 3]"
+    assert converter_init_mock.format_attribute(error, "value") == "5"
+
+    error.constraint = [1, 2, 3, 4]
+    assert converter_init_mock.format_attribute(error, "constraint") == "[1, 2, 3, 4]"
+    assert len(converter_init_mock._constraints) == 2
+
+
+def test_convert_message_no_attr_any_error(converter_init_mock):
+    converter_init_mock.any_error = False
+    converter_init_mock._diagnostics = Diagnostics(path_to_file)
+    error = ValidationError({"value": 3})
+
+    assert converter_init_mock.convert_message(error, "{{value}} < {{constraint}}") is None
+    assert not converter_init_mock.any_error
+    assert converter_init_mock.error_list == []
+
+
+@pytest.fixture
+def base_and_tenant(write_catalog):
+    base_path = write_catalog(
+        "('a',) 36 \"Base a\"\n"
+        "('a',) 36 \"Base a, again\"\n"
+        "('b',) 66 \"Base b {{value}}\"\n",
+        "base.txt",
+    )
+    tenant_path = write_catalog("('a',) 36 \"Tenant a {{value}}\"\n", "tenant.txt")
+    yield base_path, tenant_path
+
+
+def test_overlay_converter(base_and_tenant):
+    base = ErrConverter(base_and_tenant[0])
+    overlay = OverlayConverter(base_and_tenant[1], base)
+
+    assert overlay.base is base
+    assert overlay.find_messages(("a",), 36) == ("Tenant a {{value}}",)
+    assert overlay.find_messages(("b",), 66) == ("Base b {{value}}",)
+    assert overlay.find_messages(("c",), 2) == ()
+    assert overlay.user_defined_records == (
+        (("a",), 36, "Tenant a {{value}}"),
+        (("b",), 66, "Base b {{value}}"),
+    )
+    assert base.find_messages(("a",), 36) == ("Base a", "Base a, again")
+    assert not overlay.any_error
+
+
+def test_overlay_converter_stacked(base_and_tenant, write_catalog):
+    path = write_catalog("('b',) 66 \"User b\"\n", "user.txt")
+    base = ErrConverter(base_and_tenant[0])
+    overlay = OverlayConverter(path, OverlayConverter(base_and_tenant[1], base))
+
+    assert overlay.find_messages(("a",), 36) == ("Tenant a {{value}}",)
+    assert overlay.find_messages(("b",), 66) == ("User b",)
+
+
+def test_overlay_converter_empty(base_and_tenant, write_catalog):
+    path = write_catalog("", "empty.txt")
+    overlay = OverlayConverter(path, ErrConverter(base_and_tenant[0]))
+
+    assert overlay.find_messages(("a",), 36) == ("Base a", "Base a, again")
+    assert not overlay.any_error
+    assert overlay.error_list == []
+
+
+def test_overlay_converter_errors(base_and_tenant, tmp_path):
+    base = ErrConverter(tmp_path / "none.txt")
+    overlay = OverlayConverter(base_and_tenant[1], base)
+
+    assert overlay.any_error
+    assert overlay.error_list == [f"File '{tmp_path / 'none.txt'}' does not exist"]
+    assert OverlayConverter(tmp_path / "none.txt", ErrConverter(base_and_tenant[0])).any_error
+
+
+def test_overlay_converter_formats(base_and_tenant):
+    base = ErrConverter(base_and_tenant[0], {"value": AttributeFormat(max_length=4)})
+    overlay = OverlayConverter(base_and_tenant[1], base)
+    error = ValidationError({"value": "abcdefgh"})
+
+    assert overlay.convert_message(error, "{{value}}") == "a..."
+
+
+@pytest.fixture
+def defaults_catalog(write_catalog):
+    yield write_catalog(
+        "(...,) 36 \"Wrong type, {{constraint}} expected\"\n"
+        "('billing', ...) 36 \"Billing needs {{constraint}}\"\n"
+        "('billing', 'address', ...) 36 \"Address needs {{constraint}}\"\n"
+        "('billing', 'address', ...) 36 \"Check the address\"\n"
+        "('billing', 'total') 36 \"Total must be a number\"\n"
+        "('items', ...) 2 \"Item requires {{field}}\"\n"
+    )
+
+
+@pytest.mark.parametrize(
+    "path, code, result",
+    [
+        (("billing", "total"), 36, ("Total must be a number",)),
+        (("billing", "address", "zip"), 36, ("Address needs {{constraint}}", "Check the address")),
+        (("billing", "address"), 36, ("Address needs {{constraint}}", "Check the address")),
+        (("billing", 0, "vat"), 36, ("Billing needs {{constraint}}",)),
+        (("billing",), 36, ("Billing needs {{constraint}}",)),
+        (("name",), 36, ("Wrong type, {{constraint}} expected",)),
+        (("items", 3, "sku"), 2, ("Item requires {{field}}",)),
+        (("name",), 2, ()),
+        (("name",), 66, ()),
+    ],
+)
+def test_find_messages_defaults(defaults_catalog, path, code, result):
+    assert ErrConverter(defaults_catalog).find_messages(path, code) == result
+
+
+def test_find_messages_defaults_depths(defaults_catalog):
+    converter = ErrConverter(defaults_catalog)
+
+    assert converter._depths == {36: (2, 1, 0), 2: (1,)}
+    assert len(converter._defaults) == 4
+    assert list(converter._index) == [(("billing", "total"), 36)]
+
+
+@pytest.mark.parametrize(
+    "base, overlay, path, result",
+    [
+        ("('a',) 36 \"Base exact\"", '(...,) 36 "Tenant default"', ("a",), ("Base exact",)),
+        ("('a',) 36 \"Base exact\"", "('a',) 36 \"Tenant exact\"", ("a",), ("Tenant exact",)),
+        ('(...,) 36 "Base default"', '(...,) 36 "Tenant default"', ("a",), ("Tenant default",)),
+        ("('a', ...) 36 \"Base a\"", '(...,) 36 "Tenant default"', ("a", 1), ("Base a",)),
+        ('(...,) 36 "Base default"', "('a', ...) 36 \"Tenant a\"", ("a", 1), ("Tenant a",)),
+        ('(...,) 36 "Base default"', "('b',) 36 \"Tenant b\"", ("a",), ("Base default",)),
+    ],
+)
+def test_overlay_converter_defaults(write_catalog, base, overlay, path, result):
+    base_path = write_catalog(base + "\n", "base.txt")
+    overlay_path = write_catalog(overlay + "\n", "tenant.txt")
+    converter = OverlayConverter(overlay_path, ErrConverter(base_path))
 
-    assert converter_report_error_mock._report_error.call_count == call_counter
+    assert converter.find_messages(path, 36) == result
+    assert OverlayConverter(overlay_path, converter).find_messages(path, 36) == result
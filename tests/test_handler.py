@@ -0,0 +1,197 @@
+"""
+Unit tests for cerberror.handler module.
+
+"""
+from unittest.mock import patch
+
+import pytest
+from cerberus import Validator
+
+from cerberror.errors import ErrConverter
+from cerberror.handler import TranslatingErrorHandler, TranslatingValidator
+
+schema = {
+    "a": {"anyof": [{"type": "integer", "min": 10}, {"type": "string"}]},
+    "p": {"type": "dict", "schema": {"x": {"type": "integer"}, "y": {"type": "integer"}}},
+    "l": {
+        "type": "list",
+        "schema": {"oneof": [{"type": "integer"}, {"type": "dict", "schema": {"z": {"max": 1}}}]},
+    },
+}
+document = {"a": 3, "p": {"x": "s", "y": "t"}, "l": [1, "z", {"z": 5}], "q": 1}
+
+
+@pytest.fixture
+def catalog(write_catalog):
+    yield write_catalog(
+        "('a',) 147 \"None of definitions\"\n"
+        "('a',) 66 \"{{value}} < {{constraint}}\"\n"
+        "('a',) 36 \"Not a {{constraint}}\"\n"
+        "('p', 'x') 36 \"x must be an integer\"\n"
+        "('p', 'x') 36 \"x is {{value}}\"\n"
+        "('p', 'y') 36 \"y is {{foo}}\"\n"
+        "('q',) 3 \"Unknown field\"\n"
+    )
+
+
+def test_translating_validator(catalog):
+    validator = TranslatingValidator(schema, path_to_file=catalog)
+    validator.validate(document)
+    errors = validator.errors
+
+    assert errors["a"] == [
+        "None of definitions",
+        {"anyof definition 0": ["3 < 10"], "anyof definition 1": ["Not a string"]},
+    ]
+    assert errors["p"] == [
+        {"x": ["x must be an integer", "x is s"], "y": ["must be of integer type"]}
+    ]
+    assert errors["q"] == ["Unknown field"]
+    assert validator.error_handler.any_error
+
+
+def test_translating_validator_same_layout_as_cerberus(write_catalog):
+    path = write_catalog("('none',) 2 \"Required\"\n")
+    validator, translating_validator = Validator(schema), TranslatingValidator(
+        schema, path_to_file=path
+    )
+    validator.validate(document)
+    translating_validator.validate(document)
+
+    assert translating_validator.errors == validator.errors
+
+
+def test_translating_validator_reset_between_documents(catalog):
+    validator = TranslatingValidator(schema, path_to_file=catalog)
+    validator.validate(document)
+    validator.validate({"a": 20})
+
+    assert validator.errors == {}
+
+
+def test_translating_validator_emitted_once(catalog):
+    validator = TranslatingValidator(schema, path_to_file=catalog)
+    validator.validate(document)
+    handler = validator.error_handler
+    calls = list()
+    add = handler.add
+    handler.add = lambda error: calls.append(error) or add(error)
+
+    assert validator.errors == validator.errors
+    assert calls == []
+
+
+def test_translating_validator_order_of_cerberus(catalog):
+    schema = {"a": {"type": "integer", "min": 3, "allowed": [1, 2]}}
+    validator, translating_validator = Validator(schema), TranslatingValidator(
+        schema, path_to_file=catalog
+    )
+    validator.validate({"a": 0})
+    translating_validator.validate({"a": 0})
+    handler = translating_validator.error_handler
+    calls = list()
+    add = handler.add
+    handler.add = lambda error: calls.append(error) or add(error)
+
+    assert validator.errors["a"] == ["unallowed value 0", "min value is 3"]
+    assert translating_validator.errors["a"] == ["unallowed value 0", "0 < 3"]
+    assert calls == []
+
+
+def test_translating_validator_reads_catalog_once(catalog):
+    schema = {
+        "l": {
+            "type": "list",
+            "schema": {
+                "type": "dict",
+                "schema": {"x": {"type": "list", "schema": {"type": "dict"}}},
+            },
+        }
+    }
+    document = {"l": [{"x": [1, 2]}, {"x": [3]}]}
+    reference = Validator(schema)
+    reference.validate(document)
+
+    with patch.object(
+        ErrConverter, "__init__", autospec=True, side_effect=ErrConverter.__init__
+    ) as init:
+        validator = TranslatingValidator(schema, path_to_file=catalog)
+        validator.validate(document)
+
+    assert init.call_count == 1
+    assert validator.errors == reference.errors
+
+
+def test_error_handler_in_cerberus_validator(catalog):
+    validator = Validator(
+        schema, error_handler=(TranslatingErrorHandler, {"path_to_file": catalog})
+    )
+    validator.validate({"q": 1})
+
+    assert validator.errors == {"q": ["Unknown field"]}
+
+
+def test_error_handler_error_list(catalog):
+    validator = TranslatingValidator(schema, path_to_file=catalog)
+    validator.validate(document)
+
+    error_list = validator.error_handler.error_list
+
+    assert f"Invalid expression '{{{{foo}}}}' in file '{catalog}'" in error_list
+    assert (
+        f"File '{catalog}' does not contain a record for path ('l', 2, 'z') and error code 67"
+        in error_list
+    )
+    assert not any("('p', 'x')" in error for error in error_list)
+
+
+def test_error_handler_reused_validator(catalog):
+    validator = TranslatingValidator(schema, path_to_file=catalog)
+    validator.validate({"l": [{"z": 5}]})
+
+    assert validator.error_handler.any_error
+    assert validator.error_handler.error_list != []
+
+    validator.validate({"q": 1})
+
+    assert validator.errors == {"q": ["Unknown field"]}
+    assert not validator.error_handler.any_error
+    assert validator.error_handler.error_list == []
+
+    validator.validate({})
+
+    assert validator.errors == {}
+    assert not validator.error_handler.any_error
+    assert validator.error_handler.error_list == []
+
+
+def test_error_handler_invalid_expression_not_kept(catalog):
+    validator = TranslatingValidator(schema, path_to_file=catalog)
+    validator.validate({"p": {"y": "t"}})
+
+    assert validator.error_handler.error_list == [
+        f"Invalid expression '{{{{foo}}}}' in file '{catalog}'"
+    ]
+
+    validator.validate({"q": 1})
+
+    assert not validator.error_handler.any_error
+    assert validator.error_handler.error_list == []
+
+
+@pytest.mark.parametrize(
+    "paths, result",
+    [
+        ((("a",),), {"a": ["message", {}]}),
+        ((("a",), ("a",)), {"a": ["message", "message", {}]}),
+        ((("a", "b"), ("a",)), {"a": ["message", {"b": ["message", {}]}]}),
+        ((("a", 1, "c"), ("a", 2)), {"a": [{1: [{"c": ["message", {}]}], 2: ["message", {}]}]}),
+    ],
+)
+def test_insert_error(catalog, paths, result):
+    handler = TranslatingErrorHandler(path_to_file=catalog)
+
+    for path in paths:
+        handler._insert_error(path, "message")
+
+    assert handler.tree == result
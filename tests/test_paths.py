@@ -5,8 +5,9 @@ Unit tests for cerberror.paths module.
 from unittest.mock import patch
 
 import pytest
+from cerberus import Validator
 
-from cerberror.paths import PathFinder
+from cerberror.paths import PathFinder, walk_error_tree
 
 
 @pytest.fixture
@@ -109,3 +110,31 @@ def test_find_paths(path_finder, dct, result):
 
     for path in paths:
         assert path in result
+
+
+def test_walk_error_tree():
+    validator = Validator(
+        {
+            "a": {"anyof": [{"type": "integer", "min": 10}, {"type": "string"}]},
+            "p": {"type": "dict", "minlength": 3, "schema": {"x": {"type": "integer"}}},
+            "l": {"type": "list", "schema": {"oneof": [{"type": "integer"}, {"type": "string"}]}},
+        }
+    )
+    validator.validate({"a": 3, "p": {"x": "s"}, "l": [1, 2.5]})
+    tree = validator.document_error_tree
+    nodes = [(path, [error.code for error in errors]) for path, errors in walk_error_tree(tree)]
+
+    assert nodes == [
+        (("a",), [147, 66, 36]),
+        (("p",), [39, 129]),
+        (("p", "x"), [36]),
+        (("l",), [130]),
+        (("l", 1), [146, 36, 36]),
+    ]
+
+
+def test_walk_error_tree_no_errors():
+    validator = Validator({"a": {"type": "integer"}})
+    validator.validate({"a": 1})
+
+    assert list(walk_error_tree(validator.document_error_tree)) == []
@@ -0,0 +1,199 @@
+"""
+Unit tests for cerberror.profiler module and the command line interface.
+
+"""
+import json
+import tracemalloc
+
+import pytest
+from cerberus import Validator
+
+from cerberror.__main__ import main
+from cerberror.profiler import PHASES, AllocationTracker, Profiler, ProfilingTranslator
+from tests import test_handler
+
+schema = {
+    "params": {
+        "type": "dict",
+        "schema": {"var1": {"type": "integer"}, "var2": {"allowed": [7, 8, 9]}},
+    }
+}
+documents = [
+    {"params": {"var1": "Hello World!", "var2": 3.14}},
+    {"params": {"var1": 1, "var2": 7}},
+    {"params": {"var1": 2.5, "var2": 8}},
+]
+
+
+@pytest.fixture
+def catalog(write_catalog):
+    yield write_catalog(
+        "('params', 'var1') 36 \"{{value}} is not an integer!\"\n"
+        "('params', 'var2') 68 \"{{value}} not found in {{constraint}}...\"\n"
+    )
+
+
+def test_profiler_run(catalog):
+    profiler = Profiler(schema, catalog, top=2).run(documents)
+
+    assert profiler.documents == 3
+    assert tuple(profiler.timings) == PHASES
+    assert all(seconds >= 0 for seconds in profiler.timings.values())
+    assert profiler.timings["parse"] > 0
+    assert profiler.timings["rendering"] > 0
+    assert profiler.throughput > 0
+    assert len(profiler.slowest) == 2
+    assert profiler.slowest[0][1] >= profiler.slowest[1][1]
+
+
+def test_profiler_run_valid_documents(catalog):
+    profiler = Profiler(schema, catalog).run([documents[1]] * 4)
+
+    assert profiler.documents == 4
+    assert profiler.timings["parse"] == 0
+    assert "invalid: 0" in profiler.report()
+
+
+def test_profiler_report(catalog):
+    report = Profiler(schema, catalog).run(documents).report()
+
+    assert "documents: 3 (invalid: 2, not translated: 0)" in report
+    assert "docs/s" in report
+    for phase in PHASES:
+        assert phase in report
+
+
+def test_main_profile(tmp_path, catalog, capsys):
+    schema_file, documents_file = tmp_path / "s.json", tmp_path / "docs.ndjson"
+    schema_file.write_text(json.dumps(schema), encoding="utf-8")
+    documents_file.write_text("\n".join(map(json.dumps, documents)) + "\n\n", encoding="utf-8")
+    stats_file = tmp_path / "stats.prof"
+
+    status = main(
+        [
+            "profile",
+            "--schema",
+            str(schema_file),
+            "--catalog",
+            str(catalog),
+            "--cprofile",
+            str(stats_file),
+            "--tracemalloc",
+            "2",
+            str(documents_file),
+        ]
+    )
+    output = capsys.readouterr().out
+
+    assert status == 0
+    assert "documents: 3" in output
+    assert "top allocations:" in output
+    assert stats_file.exists()
+
+
+def test_allocation_tracker():
+    with AllocationTracker() as tracker:
+        assert tracemalloc.is_tracing()
+
+        with tracker.measure("outer"):
+            with tracker.measure("inner"):
+                data = [bytearray(1024) for _ in range(100)]
+
+            data.extend(bytearray(1024) for _ in range(200))
+            del data
+
+    assert not tracemalloc.is_tracing()
+    allocations = tracker.allocations
+    assert allocations["inner"][0] >= 100 * 1024
+    assert allocations["inner"][1] >= 100 * 1024
+    assert allocations["outer"][0] >= 300 * 1024
+    assert allocations["outer"][1] < 100 * 1024
+    assert allocations["outer"][2] == allocations["inner"][2] == 1
+
+
+def test_allocation_tracker_not_tracing():
+    tracker = AllocationTracker()
+
+    with tracker.measure("phase"):
+        pass
+
+    assert tracker.allocations == {}
+
+
+def test_allocation_tracker_started_before():
+    tracemalloc.start()
+
+    try:
+        with AllocationTracker():
+            pass
+
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_profiling_translator_tracker(catalog):
+    validator = Validator(schema)
+    validator.validate(documents[0])
+
+    with AllocationTracker() as tracker:
+        ProfilingTranslator(validator, catalog, tracker=tracker).translate()
+
+    assert set(tracker.allocations) == {"parse", "paths", "lookup", "matching", "rendering"}
+    assert tracker.allocations["matching"][2] == 2
+
+
+def test_profiling_translator_setters(catalog):
+    validator = Validator(schema)
+    validator.validate(documents[0])
+    timings = dict.fromkeys(PHASES, 0.0)
+    translator = ProfilingTranslator(Validator(schema), catalog, timings)
+
+    translator.validator = validator
+    translator.path_to_file = catalog
+
+    assert translator.translate() == {
+        "params -> var1": ["Hello World! is not an integer!"],
+        "params -> var2": ["3.14 not found in [7, 8, 9]..."],
+    }
+    assert translator.timings is timings
+    assert timings["rendering"] > 0
+
+
+def test_profiler_allocations(catalog):
+    profiler = Profiler(schema, catalog, track_allocations=True).run(documents)
+
+    assert set(profiler.allocations) == set(PHASES) | {"document"}
+    assert profiler.allocations["document"][2] == 3
+    assert profiler.peak_per_document > 0
+    assert "retained KiB" in profiler.report()
+    assert Profiler(schema, catalog).run(documents).allocations == {}
+
+
+def test_reference_workload_allocations(catalog, allocation_limit):
+    allocation_limit(schema, catalog, documents * 10)
+
+
+def test_reference_workload_groups_allocations(allocation_limit, write_catalog):
+    path = write_catalog("('a',) 147 \"None of definitions\"\n")
+    allocation_limit(test_handler.schema, path, [test_handler.document] * 10, limit=256 * 1024)
+
+
+def test_main_profile_allocations(tmp_path, catalog, capsys):
+    schema_path, documents_path = tmp_path / "s.json", tmp_path / "docs.ndjson"
+    schema_path.write_text(json.dumps(schema), encoding="utf-8")
+    documents_path.write_text("\n".join(map(json.dumps, documents)), encoding="utf-8")
+
+    main(
+        [
+            "profile",
+            "--schema",
+            str(schema_path),
+            "--catalog",
+            str(catalog),
+            "--allocations",
+            str(documents_path),
+        ]
+    )
+
+    assert "peak KiB" in capsys.readouterr().out
@@ -0,0 +1,161 @@
+"""
+Unit tests for cerberror.records module.
+
+"""
+import json
+import pickle
+
+import pytest
+from cerberus import Validator
+
+from cerberror.records import ErrorRecord, RecordTranslator, dump_errors, translate_records
+from cerberror.trans import NESTED, Translator
+
+schema = {
+    "a": {"anyof": [{"type": "integer", "min": 10}, {"type": "string"}]},
+    "p": {"type": "dict", "schema": {"x": {"type": "integer"}}},
+    "l": {"type": "list", "schema": {"type": "integer"}},
+}
+document = {"a": 3, "p": {"x": "s"}, "l": [1, "z"]}
+
+
+@pytest.fixture
+def catalog(write_catalog):
+    yield write_catalog(
+        "('a',) 147 \"None of definitions\"\n"
+        "('a',) 66 \"{{value}} < {{constraint}}\"\n"
+        "('a',) 36 \"Not a {{constraint}}\"\n"
+        "('p', 'x') 36 \"{{field}} must be an integer\"\n"
+        "('l', 1) 36 \"{{value}} is not an integer\"\n"
+    )
+
+
+@pytest.fixture
+def validator():
+    validator = Validator(schema)
+    validator.validate(document)
+    yield validator
+
+
+def test_error_record_dict():
+    record = ErrorRecord(("a", 1), 66, "min", 10, 3, ())
+
+    assert ErrorRecord.from_dict(json.loads(json.dumps(record.to_dict()))) == record
+    assert ErrorRecord.from_dict({"document_path": ["a"], "code": 2}) == ErrorRecord(("a",), 2)
+    assert record.field == 1
+    assert pickle.loads(pickle.dumps(record)) == record
+
+
+def test_error_record_group():
+    record = ErrorRecord(("p",), 129, "schema", child_errors=(ErrorRecord(("p", "x"), 36),))
+
+    assert ErrorRecord.from_dict(json.loads(json.dumps(record.to_dict()))) == record
+    assert record.is_group_error
+    assert not record.is_logic_error
+    assert ErrorRecord(("a",), 147).is_logic_error
+    assert not ErrorRecord(("a",), 36).is_group_error
+
+
+def test_dump_errors(validator):
+    records = dump_errors(validator)
+
+    assert json.loads(json.dumps(records, default=str)) == records
+    assert {
+        "document_path": ["p", "x"],
+        "code": 36,
+        "rule": "type",
+        "constraint": "integer",
+        "value": "s",
+        "info": [],
+        "child_errors": [],
+    } in records
+    assert len(records) == 5
+
+
+def test_dump_errors_no_errors():
+    validator = Validator(schema)
+    validator.validate({"a": 20})
+
+    assert dump_errors(validator) == []
+
+
+def test_record_translator_same_as_translator(validator, catalog):
+    records = json.loads(json.dumps(dump_errors(validator)))
+    result = RecordTranslator(records, catalog).translate()
+
+    assert result == Translator(validator, catalog).translate()
+    assert result == {
+        "a": ["None of definitions", "3 < 10", "Not a string"],
+        "p -> x": ["x must be an integer"],
+        "l -> 1": ["z is not an integer"],
+    }
+
+
+def test_record_translator_fail(validator, write_catalog):
+    path = write_catalog("('p', 'x') 36 \"{{field}} must be an integer\"\n")
+    translator = RecordTranslator(dump_errors(validator), path)
+
+    assert translator.translate(shape=NESTED) == {
+        "a": ["no definitions validate", "min value is 10", "must be of string type"],
+        "p": [{"x": ["must be of integer type"]}],
+        "l": [{1: ["must be of integer type"]}],
+    }
+    assert translator.any_error
+
+
+def test_record_translator_partial_nested_group(write_catalog):
+    path = write_catalog("('p',) 39 \"Too short\"\n")
+    validator = Validator(
+        {"p": {"type": "dict", "minlength": 2, "schema": {"x": {"type": "integer"}}}}
+    )
+    validator.validate({"p": {"x": "s"}})
+    records = json.loads(json.dumps(dump_errors(validator)))
+    translator = RecordTranslator(records, path)
+
+    assert translator.translate(partial=True) == {
+        "p": ["Too short"],
+        "p -> x": ["must be of integer type"],
+    }
+    assert translator.translate(partial=True) == Translator(validator, path).translate(partial=True)
+    assert translator.missing == ((("p", "x"), 36),)
+
+
+def test_record_translator_no_records(catalog):
+    translator = RecordTranslator([], catalog)
+
+    assert translator.translate() == {}
+    assert translator.error_list == ["No path was found"]
+
+
+def test_record_translator_validator_setter(validator, catalog):
+    translator = RecordTranslator(dump_errors(validator), catalog)
+
+    with pytest.raises(AttributeError, match="dump_errors"):
+        translator.validator = validator
+
+    translator.path_to_file = catalog
+
+    assert translator.translate() == Translator(validator, catalog).translate()
+
+
+def test_translate_records(validator, catalog):
+    records = dump_errors(validator)
+    batches = [records, records[:1], [{"document_path": ["q"], "code": 3}]]
+
+    assert translate_records(batches, catalog, sep=".") == [
+        {
+            "a": ["None of definitions", "3 < 10", "Not a string"],
+            "p.x": ["x must be an integer"],
+            "l.1": ["z is not an integer"],
+        },
+        {"p.x": ["x must be an integer"]},
+        {"q": ["unknown field"]},
+    ]
+
+
+def test_record_translator_scope(validator, catalog):
+    translator = RecordTranslator(dump_errors(validator), catalog)
+
+    assert translator.translate(only=[("p",), ("l",)], exclude=[("l", 1)]) == {
+        "p -> x": ["x must be an integer"]
+    }
@@ -0,0 +1,156 @@
+"""
+Unit tests for cerberror.registry module.
+
+"""
+import gc
+import weakref
+from unittest.mock import patch
+
+import pytest
+from cerberus import Validator
+
+from cerberror.catalog import build_index
+from cerberror.registry import Registry, schema_key
+from cerberror.trans import NESTED, Translator
+
+users = {"name": {"type": "string"}, "age": {"type": "integer", "min": 18}}
+orders = {"id": {"type": "integer"}, "items": {"type": "list", "schema": {"type": "string"}}}
+
+
+@pytest.fixture
+def catalogs(write_catalog):
+    yield write_catalog(
+        "('name',) 36 \"Name must be a {{constraint}}\"\n" "('age',) 66 \"Too young: {{value}}\"\n",
+        "users.txt",
+    ), write_catalog(
+        "('id',) 36 \"Id must be an integer\"\n" "('items', 0) 36 \"First item is {{value}}\"\n",
+        "orders.txt",
+    )
+
+
+@pytest.fixture
+def registry(catalogs):
+    registry = Registry()
+    registry.register("users", users, catalogs[0])
+    registry.register("orders", orders, catalogs[1])
+    yield registry
+
+
+def test_schema_key():
+    assert schema_key({"a": 1, "b": [1, {"c": 2, "d": 3}]}) == schema_key(
+        {"b": [1, {"d": 3, "c": 2}], "a": 1}
+    )
+    assert schema_key(users) != schema_key(orders)
+    assert schema_key(Validator(users).schema) == schema_key(Validator(dict(users)).schema)
+
+
+def test_registry_translate(registry, catalogs):
+    validator = Validator(users)
+    validator.validate({"name": 1, "age": 10})
+
+    assert registry.translate(validator) == {
+        "name": ["Name must be a string"],
+        "age": ["Too young: 10"],
+    }
+    assert registry.translate(validator, "users", shape=NESTED) == {
+        "name": ["Name must be a string"],
+        "age": ["Too young: 10"],
+    }
+    assert registry.translate(validator) == Translator(validator, catalogs[0]).translate()
+
+
+def test_registry_dispatch_by_schema(registry):
+    validator = Validator(orders)
+    validator.validate({"id": "x", "items": [1]})
+
+    assert registry.entry(validator).name == "orders"
+    assert registry.entry(validator) is registry.entry(validator)
+    assert registry.translate(validator, sep=".") == {
+        "id": ["Id must be an integer"],
+        "items.0": ["First item is 1"],
+    }
+
+
+def test_registry_dispatch_without_hashing(registry):
+    with patch("cerberror.registry.schema_key") as schema_key_mock:
+        assert registry.entry(Validator(users)).name == "users"
+        assert registry.entry(Validator(orders)).name == "orders"
+
+    schema_key_mock.assert_not_called()
+
+
+def test_registry_does_not_keep_validators(registry):
+    validators = [Validator(dict(users)) for _ in range(5)]
+    references = [weakref.ref(validator) for validator in validators]
+
+    for validator in validators:
+        validator.validate({"name": "x" * 1000})
+        registry.entry(validator)
+
+    del validators, validator
+    gc.collect()
+
+    assert all(reference() is None for reference in references)
+
+
+def test_registry_unknown_schema(registry):
+    with pytest.raises(KeyError):
+        registry.entry(Validator({"x": {"type": "integer"}}))
+
+    with pytest.raises(KeyError):
+        registry.translate(Validator(users), "products")
+
+
+def test_registry_shared_converter(catalogs):
+    registry = Registry()
+    first = registry.register("users", users, catalogs[0])
+    second = registry.register("users v2", dict(users, email={"type": "string"}), catalogs[0])
+
+    assert first.converter is second.converter
+    assert registry.names == ("users", "users v2")
+    assert "users v2" in registry
+    assert len(registry) == 2
+
+
+def test_registry_register_again(registry):
+    registry.register(
+        "users", {"name": {"type": "string"}}, registry.entry(None, "users").converter.path_to_file
+    )
+
+    with pytest.raises(KeyError):
+        registry.entry(Validator(users))
+
+    assert registry.entry(Validator({"name": {"type": "string"}})).name == "users"
+
+
+def test_registry_register_again_keeps_hash_of_other_name(catalogs):
+    registry = Registry()
+    registry.register("users", users, catalogs[0])
+    registry.register("users copy", dict(users), catalogs[0])
+    registry.register("users copy", orders, catalogs[1])
+
+    assert registry.entry(Validator(dict(users))).name == "users"
+    assert registry.entry(Validator(dict(orders))).name == "users copy"
+
+    registry.register("users", orders, catalogs[1])
+
+    assert registry.entry(Validator(dict(orders))).name == "users"
+
+
+def test_registry_loads_shards_of_schema(write_catalog, catalogs):
+    path = write_catalog(
+        catalogs[0].read_text(encoding="utf-8") + catalogs[1].read_text(encoding="utf-8"), "all.txt"
+    )
+    build_index(path)
+    registry = Registry()
+    registry.register("users", users, path)
+
+    assert sorted(registry.entry(None, "users").converter.loaded_shards) == ["'age'", "'name'"]
+
+
+def test_registry_footprint(registry):
+    footprint = registry.footprint()
+
+    assert list(footprint) == ["users", "orders"]
+    assert all(size > 0 for size in footprint.values())
+    assert footprint["users"] == registry.entry(None, "users").converter.footprint()
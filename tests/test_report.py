@@ -0,0 +1,99 @@
+"""
+Unit tests for cerberror.report module.
+
+"""
+import pytest
+from cerberus import Validator
+
+from cerberror.report import Aggregator
+
+schema = {
+    "items": {
+        "type": "list",
+        "schema": {
+            "type": "dict",
+            "schema": {"price": {"type": "integer"}, "unit": {"allowed": ["kg", "g"]}},
+        },
+    }
+}
+
+
+@pytest.fixture
+def catalog(write_catalog):
+    yield write_catalog(
+        "('items', 0, 'price') 36 \"Price must be an integer\"\n"
+        "('items', 1, 'price') 36 \"Price must be an integer\"\n"
+        "('items', 0, 'unit') 68 \"{{value}} not found in {{constraint}}\"\n"
+    )
+
+
+@pytest.mark.parametrize(
+    "path, result",
+    [(("items", 0, "price"), ("items", "price")), ((1, "a", 2), ("a",)), ((), ())],
+)
+def test_strip_indexes(path, result):
+    assert Aggregator.strip_indexes(path) == result
+
+
+def test_run(catalog):
+    rows = [
+        {"items": [{"price": "1", "unit": "lb"}]},
+        {"items": [{"price": 1, "unit": "kg"}]},
+        {"items": [{"price": "2", "unit": "oz"}, {"price": "3"}]},
+        {"items": [{"price": "4", "unit": "lb"}]},
+    ]
+    aggregator = Aggregator(catalog, sample_size=2).run(Validator(schema), rows)
+    report = aggregator.report()
+
+    assert aggregator.rows == 4
+    assert not aggregator.any_error
+    assert report["items -> price"] == [
+        {"message": "Price must be an integer", "code": 36, "count": 4, "rows": [0, 2]}
+    ]
+    assert sorted(report["items -> unit"], key=lambda entry: entry["rows"]) == [
+        {"message": "lb not found in ['kg', 'g']", "code": 68, "count": 2, "rows": [0, 3]},
+        {"message": "oz not found in ['kg', 'g']", "code": 68, "count": 1, "rows": [2]},
+    ]
+
+
+def test_run_renders_unique_errors_once(catalog):
+    aggregator = Aggregator(catalog)
+    rows = [{"items": [{"price": str(i), "unit": "lb"}]} for i in range(10)]
+
+    with pytest.MonkeyPatch.context() as mp:
+        calls = list()
+        convert_message = aggregator._converter.convert_message
+        mp.setattr(
+            aggregator._converter,
+            "convert_message",
+            lambda *args: calls.append(args) or convert_message(*args),
+        )
+        aggregator.run(Validator(schema), rows)
+
+    assert len(calls) == 2
+    assert aggregator.report("/")["items/price"][0]["count"] == 10
+
+
+def test_run_missing_record(catalog):
+    rows = [{"items": [{"price": 1}, {"price": 2}, {"unit": "lb"}]} for _ in range(3)]
+    rows.append({"items": [{"price": 1}, {"price": 2}, {"unit": "t"}]})
+    aggregator = Aggregator(catalog).run(Validator(schema), rows)
+
+    assert aggregator.any_error
+    assert aggregator.error_list == [
+        f"File '{catalog}' does not contain a record for path ('items', 2, 'unit') and error code 68"
+    ]
+    assert aggregator.missing == ((("items", "unit"), 68),)
+    assert aggregator.report()["items -> unit"] == [
+        {"message": "unallowed value lb", "code": 68, "count": 3, "rows": [0, 1, 2]},
+        {"message": "unallowed value t", "code": 68, "count": 1, "rows": [3]},
+    ]
+
+
+def test_run_rows_without_duplicates(catalog):
+    rows = [{"items": [{"price": "1"}, {"price": "2"}]}, {"items": [{"price": "3"}]}]
+    aggregator = Aggregator(catalog, sample_size=5).run(Validator(schema), rows)
+
+    assert aggregator.report()["items -> price"] == [
+        {"message": "Price must be an integer", "code": 36, "count": 3, "rows": [0, 1]}
+    ]
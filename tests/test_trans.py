@@ -2,11 +2,17 @@
 Unit tests for cerberror.trans module.
 
 """
+import json
+from io import BytesIO
 from unittest.mock import MagicMock, Mock, patch, PropertyMock
 
 import pytest
+from cerberus import Validator as CerberusValidator
 
-from cerberror.trans import Translator, ErrConverter
+from cerberror.catalog import index_records
+from cerberror.diagnostics import INVALID_EXPRESSION, NO_PATH, NO_RECORD
+from cerberror.paths import PathFinder
+from cerberror.trans import FLAT, NESTED, TUPLE, Translator, ErrConverter, join_path
 from tests.test_errors import path_to_file, ValidationError
 
 _translate_result = {"_translate": "result"}
@@ -86,6 +92,12 @@ def _translate_mock():
         yield mock
 
 
+@pytest.fixture
+def any_error_mock():
+    with patch.object(Translator, "_any_error", False, create=True) as mock:
+        yield mock
+
+
 @pytest.fixture
 def translator_init_report_error_mock(
     init_mock,
@@ -97,8 +109,18 @@ def translator_init_report_error_mock(
 ):
     translator = Translator(Mock(), path_to_file)
     translator._path_to_file = path_to_file
+    translator._expand_groups = False
+    translator._nodes = None
+    translator._scope = (None, ())
     converter = ErrConverter(path_to_file)
     converter.any_error = False
+    converter._formats = dict()
+    converter._constraints = dict()
+    converter._shards = None
+    converter._templates = dict()
+    converter._defaults = dict()
+    converter._depths = dict()
+    converter._index = dict()
     translator._converter = converter
     translator._validator = Mock()
     yield translator
@@ -111,10 +133,15 @@ def translator_init_report_error__translate_mock(init_mock, report_error_mock, _
 
     translator = Translator(Mock(), path_to_file)
     translator._validator = validator
+    translator._scope = (None, ())
     translator._converter = converter
     yield translator
 
 
+def set_records(translator, records):
+    translator._converter._index = index_records(records)
+
+
 # ==================== TESTS ====================
 
 
@@ -132,7 +159,7 @@ def test_get_paths_fail(
     translator_init_report_error_mock._get_paths()
 
     path_finder_paths_mock.assert_called_once()
-    report_error_mock.assert_called_once_with("No path was found")
+    report_error_mock.assert_called_once_with(NO_PATH)
 
 
 def test_get_records(translator_init_report_error_mock, converter_records_mock):
@@ -144,20 +171,23 @@ def test_get_records(translator_init_report_error_mock, converter_records_mock):
 @pytest.mark.parametrize(
     "errors, result",
     [
-        ("Error occurred", ["Error occurred"]),
-        (["Error1", "Error2", "Error3"], ["Error1", "Error2", "Error3"]),
+        ([(NO_PATH, {})], ["No path was found"]),
+        (
+            [(NO_RECORD, {"path": ("a",), "code": 2}), (NO_RECORD, {"path": ("a",), "code": 2})],
+            [f"File '{path_to_file}' does not contain a record for path ('a',) and error code 2"],
+        ),
     ],
 )
 def test_report_error(errors, result):
     translator = Translator({}, path_to_file)
 
-    if isinstance(errors, str):
-        translator._report_error(errors)
-    else:
-        translator._report_error(*errors)
+    for kind, details in errors:
+        translator._report_error(kind, **details)
 
     assert translator._any_error
-    assert translator._error_list == result
+    assert translator.diagnostics.messages == result
+    assert sum(translator.diagnostics.counts.values()) == len(errors)
+    assert translator.error_list == [f"File '{path_to_file}' does not exist"] + result
 
 
 @pytest.mark.parametrize(
@@ -216,7 +246,7 @@ def test__translate(
 ):
     translator_init_report_error_mock._validator = Validator(pre_errors)
     translator_init_report_error_mock._paths = paths
-    translator_init_report_error_mock._records = records
+    set_records(translator_init_report_error_mock, records)
 
     assert translator_init_report_error_mock._translate(sep) == result
     report_error_mock.assert_not_called()
@@ -262,7 +292,7 @@ def test__translate_fail(
 ):
     translator_init_report_error_mock._validator = Validator(pre_errors)
     translator_init_report_error_mock._paths = paths
-    translator_init_report_error_mock._records = records
+    set_records(translator_init_report_error_mock, records)
 
     translator_init_report_error_mock._translate(">>")
 
@@ -330,4 +360,393 @@ def test_translate_fail(
     translator_init_report_error__translate_mock.translate()
 
     _translate_mock.assert_not_called()
-    report_error_mock.assert_called_once()
+    report_error_mock.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "path, sep, result",
+    [(("a", 1, "b"), " -> ", "a -> 1 -> b"), ((1,), ".", "1"), (("a", "b"), "", "ab")],
+)
+def test_join_path(path, sep, result):
+    assert join_path(path, sep) == result
+
+
+@pytest.mark.parametrize(
+    "errors, result",
+    [
+        ({("a",): ["x"]}, {"a": ["x"]}),
+        ({("a", "b"): ["x"], ("a", "c"): ["y"]}, {"a": [{"b": ["x"], "c": ["y"]}]}),
+        ({("a", "b"): ["x"], ("a",): ["y", "z"]}, {"a": ["y", "z", {"b": ["x"]}]}),
+        ({("a",): ["y"], ("a", 0, "b"): ["x"]}, {"a": ["y", {0: [{"b": ["x"]}]}]}),
+    ],
+)
+def test_nest(errors, result):
+    assert Translator._nest(errors) == result
+
+
+@pytest.mark.parametrize(
+    "shape, result",
+    [
+        (FLAT, {"a.b": ["3 is less than 5"], "c": ["Awesome error", "Another awesome error"]}),
+        (
+            TUPLE,
+            {("a", "b"): ["3 is less than 5"], ("c",): ["Awesome error", "Another awesome error"]},
+        ),
+        (
+            NESTED,
+            {"a": [{"b": ["3 is less than 5"]}], "c": ["Awesome error", "Another awesome error"]},
+        ),
+    ],
+)
+def test__translate_shape(translator_init_report_error_mock, shape, result):
+    translator_init_report_error_mock._validator = Validator(
+        {
+            ("a", "b"): [{"code": 66, "value": 3, "constraint": 5}],
+            ("c",): [{"code": 2}, {"code": 404}],
+        }
+    )
+    translator_init_report_error_mock._paths = (("a", "b"), ("c",))
+    set_records(
+        translator_init_report_error_mock,
+        (
+            (("a", "b"), 66, "{{value}} is less than {{constraint}}"),
+            (("c",), 2, "Awesome error"),
+            (("c",), 404, "Another awesome error"),
+        ),
+    )
+
+    assert translator_init_report_error_mock._translate(".", shape) == result
+
+
+def test_translate_invalid_shape(translator_init_report_error__translate_mock):
+    with pytest.raises(ValueError):
+        translator_init_report_error__translate_mock.translate(shape="table")
+
+
+def test_write_json(translator_init_report_error_mock, report_error_mock, any_error_mock):
+    translator_init_report_error_mock._validator = Validator(
+        {("a", 1): [{"code": 66, "value": 3, "constraint": 5}], ("b",): [{"code": 2}]}
+    )
+    translator_init_report_error_mock._paths = (("a", 1), ("b",))
+    set_records(
+        translator_init_report_error_mock,
+        (
+            (("a", 1), 66, '"{{value}}" < {{constraint}}'),
+            (("b",), 2, "Awesome error"),
+        ),
+    )
+    file = BytesIO()
+    translator_init_report_error_mock.write_json(file, "/")
+
+    assert file.getvalue() == b'{"a/1": ["\\"3\\" < 5"], "b": ["Awesome error"]}'
+    assert json.loads(file.getvalue()) == {"a/1": ['"3" < 5'], "b": ["Awesome error"]}
+    report_error_mock.assert_not_called()
+
+
+def test_write_json_fail(translator_init_report_error_mock, report_error_mock, any_error_mock):
+    validator = Validator({("a",): [{"code": 66, "value": 3}]})
+    validator.errors = {"a": ["min value is 5"]}
+    translator_init_report_error_mock._validator = validator
+    translator_init_report_error_mock._paths = (("a",),)
+    set_records(translator_init_report_error_mock, ((("a",), 66, "{{value}} < {{constraint}}"),))
+    file = BytesIO()
+    report_error_mock.side_effect = lambda *args, **details: setattr(
+        translator_init_report_error_mock, "_any_error", True
+    )
+
+    with patch("cerberror.trans.ErrConverter._report_error") as converter_report_error_mock:
+        translator_init_report_error_mock.write_json(file)
+
+    assert json.loads(file.getvalue()) == {"a": ["min value is 5"]}
+    report_error_mock.assert_called_once_with(
+        INVALID_EXPRESSION, path=("a",), code=66, attr="constraint"
+    )
+    converter_report_error_mock.assert_not_called()
+
+
+def test__translate_invalid_expression(
+    translator_init_report_error_mock, report_error_mock, any_error_mock
+):
+    translator_init_report_error_mock._validator = Validator({("a",): [{"code": 66, "value": 3}]})
+    translator_init_report_error_mock._paths = (("a",),)
+    set_records(translator_init_report_error_mock, ((("a",), 66, "{{value}} < {{constraint}}"),))
+
+    translator_init_report_error_mock._translate(" -> ")
+
+    report_error_mock.assert_called_once_with(
+        INVALID_EXPRESSION, path=("a",), code=66, attr="constraint"
+    )
+    assert not translator_init_report_error_mock._converter.any_error
+
+
+@pytest.mark.parametrize(
+    "shape, result",
+    [
+        (FLAT, {"a.b": ["3 < 5", "max value is 2"], "c": ["Awesome error"]}),
+        (NESTED, {"a": [{"b": ["3 < 5", "max value is 2"]}], "c": ["Awesome error"]}),
+    ],
+)
+def test__translate_partial(
+    translator_init_report_error_mock, report_error_mock, any_error_mock, shape, result
+):
+    error = {"info": (), "field": "b", "value": 3}
+    translator_init_report_error_mock._validator = Validator(
+        {
+            ("a", "b"): [dict(error, code=66, constraint=5), dict(error, code=67, constraint=2)],
+            ("c",): [{"code": 2}],
+        }
+    )
+    translator_init_report_error_mock._paths = (("a", "b"), ("c",))
+    translator_init_report_error_mock._missing = dict()
+    set_records(
+        translator_init_report_error_mock,
+        (
+            (("a", "b"), 66, "{{value}} < {{constraint}}"),
+            (("c",), 2, "Awesome error"),
+        ),
+    )
+
+    assert translator_init_report_error_mock._translate(".", shape, partial=True) == result
+    assert translator_init_report_error_mock.missing == ((("a", "b"), 67),)
+    report_error_mock.assert_called_once_with(NO_RECORD, path=("a", "b"), code=67)
+
+
+def test__translate_partial_invalid_expression(
+    translator_init_report_error_mock, report_error_mock, any_error_mock
+):
+    translator_init_report_error_mock._validator = Validator(
+        {("a",): [{"code": 66, "value": 3, "constraint": 5, "info": (), "field": "a"}]}
+    )
+    translator_init_report_error_mock._paths = (("a",),)
+    translator_init_report_error_mock._missing = dict()
+    set_records(
+        translator_init_report_error_mock,
+        ((("a",), 66, "{{value}} < {{foo}}"), (("a",), 66, "{{value}} < {{constraint}}")),
+    )
+
+    result = translator_init_report_error_mock._translate(" -> ", partial=True)
+
+    assert result == {"a": ["min value is 5", "3 < 5"]}
+    assert translator_init_report_error_mock.missing == ((("a",), 66),)
+    report_error_mock.assert_called_once_with(INVALID_EXPRESSION, path=("a",), code=66, attr="foo")
+
+
+def test_translate_partial(write_catalog, any_error_mock):
+    path = write_catalog("('p', 'x') 36 \"x must be an integer\"\n")
+    validator = CerberusValidator(
+        {"p": {"type": "dict", "schema": {"x": {"type": "integer"}}}, "q": {"min": 2}}
+    )
+    validator.validate({"p": {"x": "s"}, "q": 1, "r": 0})
+    translator = Translator(validator, path)
+
+    assert translator.translate(partial=True) == {
+        "p -> x": ["x must be an integer"],
+        "q": ["min value is 2"],
+        "r": ["unknown field"],
+    }
+    assert sorted(translator.missing) == [(("q",), 66), (("r",), 3)]
+    assert translator.any_error
+    assert translator.translate() == validator.errors
+
+
+def test_translate_partial_nested_group(write_catalog, any_error_mock):
+    path = write_catalog(
+        "('b',) 39 \"Too short\"\n" "('b', 'd', 'e') 36 \"e must be an integer\"\n"
+    )
+    validator = CerberusValidator(
+        {
+            "b": {
+                "type": "dict",
+                "minlength": 3,
+                "schema": {
+                    "c": {"type": "integer"},
+                    "d": {"type": "dict", "schema": {"e": {"type": "integer"}}},
+                },
+            }
+        }
+    )
+    validator.validate({"b": {"c": "x", "d": {"e": "y"}}})
+    translator = Translator(validator, path)
+
+    assert translator.translate(partial=True) == {
+        "b": ["Too short"],
+        "b -> c": ["must be of integer type"],
+        "b -> d -> e": ["e must be an integer"],
+    }
+    assert translator.missing == ((("b", "c"), 36),)
+    assert translator.translate(shape=NESTED, partial=True) == {
+        "b": [
+            "Too short",
+            {"c": ["must be of integer type"], "d": [{"e": ["e must be an integer"]}]},
+        ]
+    }
+
+
+@pytest.mark.parametrize("expand_groups", [False, True])
+def test_translate_partial_nested_group_invalid_record(
+    write_catalog, any_error_mock, expand_groups
+):
+    path = write_catalog(
+        "('b',) 129 \"Bad {{foo}}\"\n"
+        "('b',) 39 \"Too short\"\n"
+        "('b', 'c') 36 \"c must be an integer\"\n"
+    )
+    validator = CerberusValidator(
+        {"b": {"type": "dict", "minlength": 2, "schema": {"c": {"type": "integer"}}}}
+    )
+    validator.validate({"b": {"c": "x"}})
+    translator = Translator(validator, path, expand_groups=expand_groups)
+
+    assert translator.translate(partial=True) == {
+        "b": ["Too short"],
+        "b -> c": ["c must be an integer"],
+    }
+    assert translator.missing == ()
+    assert translator.any_error
+
+
+def test_translate_expand_groups(write_catalog, any_error_mock):
+    path = write_catalog(
+        "('a',) 147 \"None of definitions\"\n"
+        "('a',) 66 \"{{value}} < {{constraint}}\"\n"
+        "('a',) 36 \"Not a {{constraint}}\"\n"
+        "('p',) 39 \"Too short\"\n"
+        "('p', 'x') 36 \"x must be an integer\"\n"
+        "('l',) 130 \"Some items are invalid\"\n"
+        "('l', 0) 146 \"Exactly one type\"\n"
+        "('l', 0) 36 \"Not {{constraint}}\"\n"
+    )
+    validator = CerberusValidator(
+        {
+            "a": {"anyof": [{"type": "integer", "min": 10}, {"type": "string"}]},
+            "p": {"type": "dict", "minlength": 3, "schema": {"x": {"type": "integer"}}},
+            "l": {"type": "list", "schema": {"oneof": [{"type": "integer"}, {"type": "string"}]}},
+        }
+    )
+    validator.validate({"a": 3, "p": {"x": "s"}, "l": [2.5]})
+    translator = Translator(validator, path, expand_groups=True)
+
+    assert translator.translate() == {
+        "a": ["None of definitions", "3 < 10", "Not a string"],
+        "p": ["Too short"],
+        "p -> x": ["x must be an integer"],
+        "l": ["Some items are invalid"],
+        "l -> 0": ["Exactly one type", "Not integer", "Not string"],
+    }
+    assert not translator.any_error
+
+    translator.validator = validator
+
+    assert translator.translate(shape=NESTED) == {
+        "a": ["None of definitions", "3 < 10", "Not a string"],
+        "p": ["Too short", {"x": ["x must be an integer"]}],
+        "l": ["Some items are invalid", {0: ["Exactly one type", "Not integer", "Not string"]}],
+    }
+
+
+def test_translate_expand_groups_same_as_paths(write_catalog, any_error_mock):
+    path = write_catalog(
+        "('a',) 147 \"None of definitions\"\n"
+        "('a',) 66 \"{{value}} < {{constraint}}\"\n"
+        "('a',) 36 \"Not a {{constraint}}\"\n"
+        "('l', 1) 36 \"{{value}} is not an integer\"\n"
+    )
+    validator = CerberusValidator(
+        {
+            "a": {"anyof": [{"type": "integer", "min": 10}, {"type": "string"}]},
+            "l": {"type": "list", "schema": {"type": "integer"}},
+        }
+    )
+    validator.validate({"a": 3, "l": [1, "z"]})
+
+    assert (
+        Translator(validator, path, expand_groups=True).translate()
+        == Translator(validator, path).translate()
+    )
+
+
+scope_schema = {
+    "name": {"type": "string"},
+    "billing": {
+        "type": "dict",
+        "schema": {
+            "total": {"type": "integer"},
+            "address": {"type": "dict", "schema": {"zip": {"type": "string"}}},
+        },
+    },
+    "items": {"type": "list", "schema": {"type": "dict", "schema": {"sku": {"type": "string"}}}},
+}
+scope_document = {
+    "name": 1,
+    "billing": {"total": "x", "address": {"zip": 1}},
+    "items": [{"sku": 1}, {"sku": 2}],
+}
+
+
+@pytest.fixture
+def scope_catalog(write_catalog):
+    yield write_catalog('(...,) 36 "{{field}} must be {{constraint}}"\n')
+
+
+@pytest.mark.parametrize("expand_groups", [False, True])
+@pytest.mark.parametrize(
+    "only, exclude, result",
+    [
+        (
+            None,
+            None,
+            [
+                "name",
+                "billing -> total",
+                "billing -> address -> zip",
+                "items -> 0 -> sku",
+                "items -> 1 -> sku",
+            ],
+        ),
+        ([("billing",)], None, ["billing -> total", "billing -> address -> zip"]),
+        (
+            [("billing",), ("items", 0)],
+            None,
+            ["billing -> total", "billing -> address -> zip", "items -> 0 -> sku"],
+        ),
+        ([("billing",)], [("billing", "address")], ["billing -> total"]),
+        (None, [("billing",), ("items", 1)], ["name", "items -> 0 -> sku"]),
+        ([("billing", "address", "zip")], None, ["billing -> address -> zip"]),
+        ([("billing", "address")], [("billing",)], []),
+        ([("phone",)], None, []),
+    ],
+)
+def test_translate_scope(scope_catalog, any_error_mock, expand_groups, only, exclude, result):
+    validator = CerberusValidator(scope_schema)
+    validator.validate(scope_document)
+    translator = Translator(validator, scope_catalog, expand_groups=expand_groups)
+    errors = translator.translate(only=only, exclude=exclude)
+
+    assert sorted(errors) == sorted(result)
+    assert all(len(messages) == 1 for messages in errors.values())
+
+
+def test_translate_scope_prunes_before_path_finder(scope_catalog, any_error_mock):
+    validator = CerberusValidator(scope_schema)
+    validator.validate(scope_document)
+
+    with patch("cerberror.trans.PathFinder", wraps=PathFinder) as path_finder_mock:
+        Translator(validator, scope_catalog).translate(only=[("items", 0)])
+
+    assert path_finder_mock.call_args.args[0] == {
+        "items": [{0: [{"sku": ["must be of string type"]}]}]
+    }
+
+
+def test_translate_scope_fail(write_catalog, any_error_mock):
+    path = write_catalog("('name',) 36 \"Name must be a string\"\n")
+    validator = CerberusValidator(scope_schema)
+    validator.validate(scope_document)
+    translator = Translator(validator, path)
+
+    assert translator.translate(only=[("billing", "address")]) == {
+        "billing": [{"address": [{"zip": ["must be of string type"]}]}]
+    }
+    assert translator.any_error
+    assert translator.translate(only=[("name",)]) == {"name": ["Name must be a string"]}
+    assert not translator.any_error